@@ -1,73 +1,627 @@
+import os
+import sys
+import copy
+import html
+import json
+import time
+import zipfile
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PIL import Image
+from PIL import Image, ImageDraw, ImageFont, ImageSequence
 import tkinter.font as tkfont
+import numpy as np
+
+
+EXPORT_BUFFER_SIZE = 1 << 20  # bytes buffered by the ANSI / HTML / text exporters
 
 
 class AsciiArtConverter:
     """
     Converts images (PNG/JPG) into ASCII art.
+    Optional render modes: custom or auto-generated ramps, ordered or
+    Floyd-Steinberg dithering, per-cell color for ANSI / HTML export, and
+    a "glyph" engine that picks the character whose shape best matches each cell.
     """
 
     # From dark to light
     ASCII_CHARS = "@%#*+=-:. "
 
-    def __init__(self, new_width: int = 80):
+    # sanity limit only; the viewer renders just the visible part
+    MAX_WIDTH = 10000
+
+    # resampling filters selectable for the final resize (fastest first)
+    RESAMPLE_FILTERS = {
+        "nearest": Image.Resampling.NEAREST,
+        "box": Image.Resampling.BOX,
+        "bilinear": Image.Resampling.BILINEAR,
+        "hamming": Image.Resampling.HAMMING,
+        "bicubic": Image.Resampling.BICUBIC,
+        "lanczos": Image.Resampling.LANCZOS,
+    }
+
+    DITHER_MODES = ("none", "ordered", "floyd-steinberg")
+
+    # 4x4 Bayer matrix, normalized to thresholds in (0, 1)
+    BAYER_4 = (np.array([
+        [0, 8, 2, 10],
+        [12, 4, 14, 6],
+        [3, 11, 1, 9],
+        [15, 7, 13, 5],
+    ]) + 0.5) / 16
+
+    # "ramp": brightness -> ramp character; "glyph": best structural glyph match
+    ENGINES = ("ramp", "glyph")
+
+    # width / height of a character cell; output rows are scaled by it
+    CHAR_ASPECT = 0.55
+
+    # pixels per character cell compared in glyph mode (width, height);
+    # 6 / 11 stays close to CHAR_ASPECT so glyph matching sees undistorted cells
+    GLYPH_CELL = (6, 11)
+    GLYPH_CHARS = "".join(chr(c) for c in range(32, 127))
+    MONO_FONTS = ("DejaVuSansMono.ttf", "consola.ttf", "cour.ttf", "Courier New.ttf", "Menlo.ttc")
+
+    # charset -> (char codes, glyph matrix (K, P), squared norms (K,)); shared by all instances
+    _glyph_sets = {}
+
+    def __init__(self, new_width: int = 80, resample: str = "bicubic",
+                 ramp: str = None, dither: str = "none", engine: str = "ramp"):
         self.new_width = new_width
+        self.resample = resample
+        self.dither = dither
+        self.engine = engine
+        self.set_ramp(ramp or self.ASCII_CHARS)
+
+    @staticmethod
+    def _build_lut(chars: str) -> np.ndarray:
+        """
+        256-entry lookup table: gray value -> character code.
+        Uses the same int(pixel * scale) rounding as the per-pixel mapping.
+        """
+        scale = (len(chars) - 1) / 255
+        codes = [ord(chars[int(v * scale)]) for v in range(256)]
+        dtype = np.uint8 if max(codes) < 128 else np.uint32
+        return np.array(codes, dtype=dtype)
+
+    @staticmethod
+    def generate_ramp(levels: int = 10, charset: str = None) -> str:
+        """
+        Build a dark-to-light ramp of `levels` characters by rendering each
+        candidate with PIL's default font and sorting by ink coverage.
+        """
+        if charset is None:
+            charset = "".join(chr(c) for c in range(32, 127))
+        font = ImageFont.load_default()
+        left, top, right, bottom = font.getbbox("M")
+        size = (max(1, right - left) + 2, max(1, bottom - top) + 4)
+
+        coverage = []
+        for ch in dict.fromkeys(charset):
+            glyph = Image.new("L", size, 0)
+            ImageDraw.Draw(glyph).text((1 - left, 2 - top), ch, fill=255, font=font)
+            coverage.append((np.asarray(glyph).sum(), ch))
+        coverage.sort(reverse=True)  # most ink = darkest first
+
+        levels = max(2, min(levels, len(coverage)))
+        ink = np.array([c for c, _ in coverage], dtype=np.float64)
+        ramp = []
+        for target in np.linspace(ink[0], ink[-1], levels):
+            # nearest unused glyph to the evenly spaced ink level
+            for idx in np.argsort(np.abs(ink - target)):
+                ch = coverage[idx][1]
+                if ch not in ramp:
+                    ramp.append(ch)
+                    break
+        return "".join(ramp)
 
     def set_width(self, new_width: int):
         if new_width <= 0:
             messagebox.showerror("Error", "Width must be positive.")
             return
-        elif new_width > 632:
-            messagebox.showerror("Error", "Width too large; max is 632.")
+        elif new_width > self.MAX_WIDTH:
+            messagebox.showerror("Error", f"Width too large; max is {self.MAX_WIDTH}.")
             return
         self.new_width = new_width
 
-    def _resize_image(self, image: Image.Image) -> Image.Image:
+    def set_resample(self, name: str):
+        if name not in self.RESAMPLE_FILTERS:
+            raise ValueError(f"Unknown resampling filter: {name}")
+        self.resample = name
+
+    def set_ramp(self, chars: str):
+        """
+        Use `chars` (dark to light) as the ramp; "auto" generates one.
+        """
+        if chars == "auto":
+            chars = self.generate_ramp()
+        if len(chars) < 2:
+            raise ValueError("Ramp needs at least 2 characters.")
+        self.ramp = chars
+        self._ascii_lut = self._build_lut(chars)
+        dtype = np.uint8 if max(map(ord, chars)) < 128 else np.uint32
+        self._ramp_codes = np.array([ord(c) for c in chars], dtype=dtype)
+
+    def set_dither(self, mode: str):
+        if mode not in self.DITHER_MODES:
+            raise ValueError(f"Unknown dither mode: {mode}")
+        self.dither = mode
+
+    def set_engine(self, engine: str):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
+
+    @classmethod
+    def _load_mono_font(cls):
+        for name in cls.MONO_FONTS:
+            try:
+                return ImageFont.truetype(name, 24)
+            except OSError:
+                continue
+        return ImageFont.load_default()
+
+    @classmethod
+    def _glyph_set(cls, charset: str):
+        """
+        Render every character of `charset` once into a GLYPH_CELL bitmap
+        (ink = 1.0) and cache the flattened set per charset.
+        """
+        if charset not in cls._glyph_sets:
+            font = cls._load_mono_font()
+            ascent, descent = font.getmetrics()
+            cell_w = max(1, int(round(font.getlength("M"))))
+            cell_h = ascent + descent
+
+            bitmaps = []
+            for ch in charset:
+                glyph = Image.new("L", (cell_w, cell_h), 0)
+                # center horizontally in case the fallback font is proportional
+                offset = (cell_w - font.getlength(ch)) / 2
+                ImageDraw.Draw(glyph).text((offset, 0), ch, fill=255, font=font)
+                glyph = glyph.resize(cls.GLYPH_CELL, Image.Resampling.BOX)
+                bitmaps.append(np.asarray(glyph, dtype=np.float32).reshape(-1) / 255)
+
+            glyphs = np.stack(bitmaps)
+            dtype = np.uint8 if max(map(ord, charset)) < 128 else np.uint32
+            codes = np.array([ord(c) for c in charset], dtype=dtype)
+            cls._glyph_sets[charset] = (codes, glyphs, (glyphs * glyphs).sum(axis=1))
+        return cls._glyph_sets[charset]
+
+    def _match_glyphs(self, gray: np.ndarray) -> np.ndarray:
+        """
+        For a gray array of rows * GLYPH_CELL pixels, return the index of
+        the glyph with minimal SSE per cell, for all cells in one matrix product:
+        |c - g|^2 = |c|^2 - 2 c.g + |g|^2, and |c|^2 does not affect the argmin.
+        """
+        _, glyphs, norms = self._glyph_set(self.GLYPH_CHARS)
+        gw, gh = self.GLYPH_CELL
+        rows, cols = gray.shape[0] // gh, gray.shape[1] // gw
+
+        # dark pixels are ink (same polarity as the ramp: '@' = dark)
+        ink = (255 - gray[:rows * gh, :cols * gw]).astype(np.float32) / 255
+        cells = ink.reshape(rows, gh, cols, gw).transpose(0, 2, 1, 3).reshape(rows * cols, gh * gw)
+
+        scores = norms[np.newaxis, :] - 2 * (cells @ glyphs.T)
+        return scores.argmin(axis=1).reshape(rows, cols)
+
+    def _cell_chars(self) -> str:
+        return self.GLYPH_CHARS if self.engine == "glyph" else self.ramp
+
+    def _target_size(self, image: Image.Image):
         """
-        Resize image preserving aspect ratio.
+        Output size in characters, preserving aspect ratio.
         Height is adjusted because characters are taller than they are wide.
         """
         width, height = image.size
         aspect_ratio = height / width
 
         # tweak height factor so ASCII looks less squashed
-        new_height = int(self.new_width * aspect_ratio * 0.55)
+        new_height = int(self.new_width * aspect_ratio * self.CHAR_ASPECT)
+        return self.new_width, max(1, new_height)
 
-        return image.resize((self.new_width, max(1, new_height)))
+    def _resize_image(self, image: Image.Image, size=None) -> Image.Image:
+        """
+        Resize image to `size` (default: _target_size()).
+        Large integer downscales go through reduce() first (cheap box
+        averaging), leaving at least 2x for the selected filter.
+        """
+        if size is None:
+            size = self._target_size(image)
+        width, height = image.size
+        factor = min(width // size[0], height // size[1]) // 2
+        if factor >= 2:
+            image = image.reduce(factor)
+
+        return image.resize(size, self.RESAMPLE_FILTERS[self.resample])
 
     def _to_grayscale(self, image: Image.Image) -> Image.Image:
         return image.convert("L")  # grayscale
 
+    def _quantize(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Map a uint8 gray array to ramp indices using the current dither mode.
+        """
+        top = len(self.ramp) - 1
+
+        if self.dither == "ordered":
+            h, w = gray.shape
+            reps = (h // 4 + 1, w // 4 + 1)
+            threshold = np.tile(self.BAYER_4, reps)[:h, :w]
+            levels = gray * (top / 255) + threshold
+            return np.clip(levels.astype(np.intp), 0, top)
+
+        if self.dither == "floyd-steinberg":
+            return self._floyd_steinberg(gray, top)
+
+        # no dithering: same int(pixel * scale) rounding as the lookup table
+        return (gray * (top / 255)).astype(np.intp)
+
+    @staticmethod
+    def _floyd_steinberg(gray: np.ndarray, top: int) -> np.ndarray:
+        """
+        Floyd-Steinberg error diffusion, vectorized over wavefronts:
+        pixel (y, x) only depends on fronts with smaller x + 2y, so every
+        front x + 2y = t is quantized in one array operation.
+        """
+        h, w = gray.shape
+        # one column of padding on each side and one row below swallow
+        # the error that diffuses off the image
+        buf = np.zeros((h + 1, w + 2), dtype=np.float64)
+        buf[:h, 1:w + 1] = gray * (top / 255)
+        out = np.empty((h, w), dtype=np.intp)
+
+        for t in range(w + 2 * (h - 1)):
+            ys = np.arange(max(0, (t - w + 2) // 2), min(h - 1, t // 2) + 1)
+            xs = t - 2 * ys
+            xp = xs + 1
+            values = buf[ys, xp]
+            levels = np.clip(np.rint(values), 0, top)
+            out[ys, xs] = levels
+            err = values - levels
+            buf[ys, xp + 1] += err * (7 / 16)
+            buf[ys + 1, xp - 1] += err * (3 / 16)
+            buf[ys + 1, xp] += err * (5 / 16)
+            buf[ys + 1, xp + 1] += err * (1 / 16)
+        return out
+
+    def _indices_to_text(self, indices: np.ndarray) -> str:
+        """
+        Turn a 2D array of ramp (or glyph) indices into text lines in one buffer.
+        """
+        height, width = indices.shape
+        if self.engine == "glyph":
+            codes = self._glyph_set(self.GLYPH_CHARS)[0]
+        else:
+            codes = self._ramp_codes
+        buffer = np.empty((height, width + 1), dtype=codes.dtype)
+        buffer[:, :width] = codes[indices]
+        buffer[:, width] = ord("\n")
+
+        # drop the trailing newline of the last row
+        data = buffer.reshape(-1)[:-1].tobytes()
+        return data.decode("ascii" if codes.dtype == np.uint8 else "utf-32-le")
+
     def _map_pixels_to_ascii(self, image: Image.Image) -> str:
         """
-        Map each pixel to an ASCII character based on brightness.
+        Map each pixel of a grayscale image to an ASCII character based on
+        brightness, one text line per pixel row.
+        Vectorized: without dithering, gray values go through the lookup
+        table, a newline column is appended and the whole buffer is decoded at once.
+        """
+        pixels = np.asarray(image, dtype=np.uint8)
+        if self.dither != "none":
+            return self._indices_to_text(self._quantize(pixels))
+
+        height, width = pixels.shape
+
+        lut = self._ascii_lut
+        buffer = np.empty((height, width + 1), dtype=lut.dtype)
+        buffer[:, :width] = lut[pixels]
+        buffer[:, width] = ord("\n")
+
+        # drop the trailing newline of the last row
+        data = buffer.reshape(-1)[:-1].tobytes()
+        return data.decode("ascii" if lut.dtype == np.uint8 else "utf-32-le")
+
+    def _prepare(self, image: Image.Image, color: bool = False, cell=(1, 1)) -> Image.Image:
+        """
+        Draft-decode (JPEG), convert and resize to the output size
+        times `cell` pixels per character.
+        Returns an "L" image, or "RGB" if `color` is set.
+        For a not-yet-loaded JPEG, draft() makes the decoder produce its
+        output at the smallest DCT scale (1/2 .. 1/8) still above the output size.
         """
-        pixels = image.getdata()
-        chars = []
-        scale = (len(self.ASCII_CHARS) - 1) / 255
+        cols, rows = self._target_size(image)
+        size = (cols * cell[0], rows * cell[1])
+        if image.format == "JPEG":
+            image.draft("RGB" if color else "L", size)
 
-        for pixel in pixels:
-            chars.append(self.ASCII_CHARS[int(pixel * scale)])
+        image = image.convert("RGB") if color else self._to_grayscale(image)
+        return self._resize_image(image, size)
 
-        return "".join(chars)
+    def image_to_ascii(self, image: Image.Image) -> str:
+        """
+        Pipeline for an already opened image: grayscale, resize, map to ASCII lines.
+        """
+        if self.engine == "glyph":
+            gray = np.asarray(self._prepare(image, cell=self.GLYPH_CELL), dtype=np.uint8)
+            return self._indices_to_text(self._match_glyphs(gray))
+        return self._map_pixels_to_ascii(self._prepare(image))
 
     def image_file_to_ascii(self, filepath: str) -> str:
         """
-        Full pipeline: open image, resize, grayscale, map to ASCII, format lines.
+        Full pipeline: open image, resize, grayscale, map to ASCII lines.
         """
         image = Image.open(filepath)
-        image = self._resize_image(image)
-        image = self._to_grayscale(image)
-
-        ascii_chars = self._map_pixels_to_ascii(image)
-        # break string into lines of new_width
-        lines = [
-            ascii_chars[i:i + self.new_width]
-            for i in range(0, len(ascii_chars), self.new_width)
+        return self.image_to_ascii(image)
+
+    def image_to_cells(self, image: Image.Image):
+        """
+        Per-cell render data for colored output.
+        Returns (indices, colors): ramp (or glyph) indices (h, w) and RGB uint8 (h, w, 3).
+        In glyph mode the image is decoded once at glyph resolution and the
+        cell colors are box-averaged from it, so the JPEG draft never goes
+        below what the glyph match needs.
+        """
+        if self.engine == "glyph":
+            rgb = self._prepare(image, color=True, cell=self.GLYPH_CELL)
+            gray = np.asarray(rgb.convert("L"), dtype=np.uint8)
+            colors = np.asarray(rgb.reduce(self.GLYPH_CELL), dtype=np.uint8)
+            return self._match_glyphs(gray), colors
+        rgb = self._prepare(image, color=True)
+        colors = np.asarray(rgb, dtype=np.uint8)
+        gray = np.asarray(rgb.convert("L"), dtype=np.uint8)
+        return self._quantize(gray), colors
+
+    def frames_to_ascii(self, filepath: str):
+        """
+        Yield (ascii_art, duration_ms) for every frame of an animated
+        GIF/WebP (a still image yields a single frame).
+        """
+        with Image.open(filepath) as image:
+            for frame in ImageSequence.Iterator(image):
+                yield self.image_to_ascii(frame), frame.info.get("duration", 0)
+
+    # ---- colored export (streamed row by row) ----
+
+    def _color_runs(self, row_indices, row_colors):
+        """
+        Yield (text, (r, g, b)) runs of equal color within one row.
+        """
+        chars = self._cell_chars()
+        flat = row_colors.astype(np.uint32)
+        packed = (flat[:, 0] << 16) | (flat[:, 1] << 8) | flat[:, 2]
+        starts = np.flatnonzero(np.r_[True, packed[1:] != packed[:-1]])
+        ends = np.r_[starts[1:], len(packed)]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            text = "".join(chars[i] for i in row_indices[start:end].tolist())
+            yield text, tuple(row_colors[start].tolist())
+
+    def write_ansi(self, stream, indices, colors):
+        """
+        Write cells as ANSI truecolor text (one escape per color run).
+        """
+        for y in range(indices.shape[0]):
+            for text, (r, g, b) in self._color_runs(indices[y], colors[y]):
+                stream.write(f"\x1b[38;2;{r};{g};{b}m{text}")
+            stream.write("\x1b[0m\n")
+
+    def write_html(self, stream, indices, colors):
+        """
+        Write cells as an HTML page with one colored <span> per color run.
+        """
+        stream.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"></head>\n"
+            "<body style=\"background:#000\"><pre style=\"font-family:monospace;"
+            "line-height:1;font-size:8px\">\n"
+        )
+        for y in range(indices.shape[0]):
+            for text, (r, g, b) in self._color_runs(indices[y], colors[y]):
+                stream.write(f"<span style=\"color:#{r:02x}{g:02x}{b:02x}\">{html.escape(text)}</span>")
+            stream.write("\n")
+        stream.write("</pre></body></html>\n")
+
+    def export_file(self, filepath: str, out_path: str, fmt: str = None):
+        """
+        Convert `filepath` and write it to `out_path` as "txt", "ansi" or "html"
+        (default: from the output extension) through a buffered stream.
+        """
+        if fmt is None:
+            ext = os.path.splitext(out_path)[1].lower()
+            fmt = {".html": "html", ".htm": "html", ".ans": "ansi"}.get(ext, "txt")
+        if fmt not in ("txt", "ansi", "html"):
+            raise ValueError(f"Unknown export format: {fmt}")
+
+        with Image.open(filepath) as image:
+            with open(out_path, "w", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as stream:
+                if fmt == "txt":
+                    stream.write(self.image_to_ascii(image))
+                    stream.write("\n")
+                    return
+                indices, colors = self.image_to_cells(image)
+                if fmt == "ansi":
+                    self.write_ansi(stream, indices, colors)
+                else:
+                    self.write_html(stream, indices, colors)
+
+
+# --------- Headless batch / frame conversion ---------
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp")
+FRAMES_PER_TASK = 50  # minimum frames of one animation converted per worker task
+ARCHIVE_MANIFEST = "frames.json"
+
+
+def _convert_frames_task(task):
+    """
+    Worker entry point: convert frames [start, stop) of one image file.
+    Returns a list of (frame_index, ascii_art, duration_ms).
+    GIF/WebP frames depend on their predecessors, so the first seek decodes
+    frames 0..start-1 again; batch_convert keeps that cost bounded by giving
+    each worker one contiguous range per animation rather than many small ones.
+    """
+    path, options, start, stop = task
+    converter = AsciiArtConverter(**options)
+    results = []
+    with Image.open(path) as image:
+        for index in range(start, stop):
+            image.seek(index)
+            results.append((index, converter.image_to_ascii(image), image.info.get("duration", 0)))
+    return results
+
+
+def _collect_images(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.append(os.path.join(item, name))
+        else:
+            paths.append(item)
+    return paths
+
+
+def _frame_name(stem, n_frames, index):
+    return f"{stem}.txt" if n_frames == 1 else f"{stem}_{index:05d}.txt"
+
+
+def _output_stems(frame_counts):
+    """
+    Unique output stem per input path: the file stem, or on a clash (a.gif
+    and a.webp, equal names from different folders) the stem plus extension
+    and then a counter, so no two frames share an output name.
+    """
+    used = set()
+    stems = {}
+    for path, n_frames in frame_counts.items():
+        stem, ext = os.path.splitext(os.path.basename(path))
+        candidates = [stem, f"{stem}_{ext.lstrip('.')}"]
+        for attempt in range(len(candidates) + 1000):
+            candidate = candidates[attempt] if attempt < len(candidates) else f"{candidates[1]}_{attempt}"
+            names = {_frame_name(candidate, n_frames, i) for i in range(n_frames)}
+            if used.isdisjoint(names):
+                break
+        used |= names
+        stems[path] = candidate
+    return stems
+
+
+def batch_convert(inputs, out_dir=None, width=80, workers=1, archive=None, resample="bicubic",
+                  ramp=None, dither="none", engine="ramp"):
+    """
+    Convert image files and/or directories of images to ASCII across a process
+    pool. Animated GIF/WebP files are expanded frame by frame.
+    Writes one .txt per frame into `out_dir` ("<name>.txt" for stills,
+    "<name>_00000.txt" for animations; clashing names get the extension or a
+    counter appended, see _output_stems) or, if `archive` is given, a single
+    zip with the frame texts plus a frames.json manifest of names and durations.
+    `resample`, `ramp`, `dither` and `engine` are passed on to AsciiArtConverter.
+    Returns the number of frames written.
+    """
+    if width <= 0 or width > AsciiArtConverter.MAX_WIDTH:
+        raise ValueError(f"Width must be between 1 and {AsciiArtConverter.MAX_WIDTH}.")
+    if not out_dir and not archive:
+        raise ValueError("Need an output directory or an archive path.")
+    if resample not in AsciiArtConverter.RESAMPLE_FILTERS:
+        raise ValueError(f"Unknown resampling filter: {resample}")
+    if dither not in AsciiArtConverter.DITHER_MODES:
+        raise ValueError(f"Unknown dither mode: {dither}")
+    if engine not in AsciiArtConverter.ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if ramp == "auto":
+        ramp = AsciiArtConverter.generate_ramp()  # once, not per worker
+
+    options = {"new_width": width, "resample": resample, "ramp": ramp, "dither": dither, "engine": engine}
+
+    tasks = []
+    frame_counts = {}
+    for path in dict.fromkeys(_collect_images(inputs)):  # each file once
+        with Image.open(path) as image:
+            n_frames = getattr(image, "n_frames", 1)
+        frame_counts[path] = n_frames
+        # about one range per worker: every extra range re-decodes its prefix
+        chunk = max(FRAMES_PER_TASK, -(-n_frames // max(1, workers)))
+        for start in range(0, n_frames, chunk):
+            tasks.append((path, options, start, min(n_frames, start + chunk)))
+    stems = _output_stems(frame_counts)
+
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    zf = zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) if archive else None
+    manifest = {"width": width, "frames": []}
+    written = 0
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        results = pool.map(_convert_frames_task, tasks) if pool else map(_convert_frames_task, tasks)
+        # results arrive in task order, so frames are written in sequence
+        for (path, _, _, _), frames in zip(tasks, results):
+            for index, ascii_art, duration in frames:
+                name = _frame_name(stems[path], frame_counts[path], index)
+                if zf:
+                    zf.writestr(name, ascii_art)
+                    manifest["frames"].append({"name": name, "duration": duration})
+                else:
+                    with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+                        f.write(ascii_art)
+                written += 1
+        if zf:
+            zf.writestr(ARCHIVE_MANIFEST, json.dumps(manifest))
+    finally:
+        if pool:
+            pool.shutdown()
+        if zf:
+            zf.close()
+
+    return written
+
+
+def load_frames_archive(path):
+    """
+    Read an archive written by batch_convert().
+    Returns a list of (ascii_art, duration_ms) in playback order.
+    """
+    with zipfile.ZipFile(path) as zf:
+        manifest = json.loads(zf.read(ARCHIVE_MANIFEST))
+        return [
+            (zf.read(frame["name"]).decode("utf-8"), frame["duration"])
+            for frame in manifest["frames"]
         ]
-        return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point for headless batch conversion, e.g.:
+        python AsciiArtConverter.py anim.gif --archive anim_frames.zip --width 120 --workers 4
+        python AsciiArtConverter.py photos/ --out ascii/
+    """
+    parser = argparse.ArgumentParser(description="Convert images / animation frames to ASCII art.")
+    parser.add_argument("inputs", nargs="+", help="image files or directories")
+    parser.add_argument("--width", type=int, default=80, help="output width in characters")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--resample", choices=list(AsciiArtConverter.RESAMPLE_FILTERS), default="bicubic",
+                        help="resampling filter for the final resize")
+    parser.add_argument("--ramp", help="characters from dark to light, or 'auto'")
+    parser.add_argument("--dither", choices=AsciiArtConverter.DITHER_MODES, default="none")
+    parser.add_argument("--engine", choices=AsciiArtConverter.ENGINES, default="ramp",
+                        help="ramp: brightness ramp; glyph: best-matching character shape")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="directory for one .txt per frame")
+    target.add_argument("--archive", help="single .zip of frames (playable in the app)")
+    args = parser.parse_args(argv)
+
+    try:
+        start = time.perf_counter()
+        count = batch_convert(args.inputs, out_dir=args.out, width=args.width,
+                              workers=args.workers, archive=args.archive, resample=args.resample,
+                              ramp=args.ramp, dither=args.dither, engine=args.engine)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    print(f"Converted {count} frame(s) in {time.perf_counter() - start:.2f}s")
 
 
 # --------- UI (no additional classes) ---------
@@ -84,11 +638,26 @@ class AsciiArtConverterApp:
             # set a default size
             root.geometry("900x600")
 
-            # monospaced font so columns line up; size will be auto-adjusted
-            ascii_font = tkfont.Font(family="Courier", size=10)
+            # monospaced fonts so columns line up, one per size, with metrics
+            # measured once: size -> (font, char_width, line_height)
+            fonts = {}
+            view = {"size": 10, "pending": None}
+
+            # last ASCII split into lines; only the visible part is drawn
+            last_ascii = {"text": "", "lines": [], "max_len": 0}
 
-            # will store last ASCII so we can refit if needed (if you want later)
-            last_ascii = {"text": ""}
+            # ramp text last applied to the converter ("" = default ramp)
+            render_state = {"ramp": ""}
+
+            # frame playback state
+            playback = {"frames": [], "fps": 10.0, "start": 0.0, "shown": -1, "after_id": None,
+                        "loading": False, "error": None}
+
+            def get_font(size):
+                if size not in fonts:
+                    font = tkfont.Font(family="Courier", size=size)
+                    fonts[size] = (font, font.measure("M"), font.metrics("linespace"))
+                return fonts[size]
 
             def choose_image():
                 path = filedialog.askopenfilename(
@@ -101,21 +670,60 @@ class AsciiArtConverterApp:
                     entry_file.delete(0, tk.END)
                     entry_file.insert(0, path)
 
-            def auto_fit_ascii_to_box(ascii_art: str):
+            def update_scrollregion():
+                _, char_w, line_h = get_font(view["size"])
+                canvas_output.configure(scrollregion=(
+                    0, 0,
+                    last_ascii["max_len"] * char_w,
+                    len(last_ascii["lines"]) * line_h,
+                ))
+
+            def render_visible():
                 """
-                Shrink font size so the *longest* line fits into the text widget width.
+                Draw only the rows and columns currently inside the viewport.
                 """
-                lines = ascii_art.splitlines()
+                view["pending"] = None
+                canvas_output.delete("ascii")
+                lines = last_ascii["lines"]
                 if not lines:
                     return
 
-                max_len = max(len(line) for line in lines)
+                font, char_w, line_h = get_font(view["size"])
+                left = canvas_output.canvasx(0)
+                top = canvas_output.canvasy(0)
+                first_row = max(0, int(top // line_h))
+                last_row = min(len(lines), first_row + canvas_output.winfo_height() // line_h + 2)
+                first_col = max(0, int(left // char_w))
+                last_col = first_col + canvas_output.winfo_width() // char_w + 2
+
+                for row in range(first_row, last_row):
+                    canvas_output.create_text(
+                        first_col * char_w, row * line_h,
+                        text=lines[row][first_col:last_col],
+                        anchor="nw", font=font, tags="ascii",
+                    )
+
+            def schedule_render(*_args):
+                # coalesce bursts of scroll / resize events into one redraw
+                if view["pending"] is None:
+                    view["pending"] = root.after_idle(render_visible)
+
+            def set_font_size(size):
+                view["size"] = size
+                canvas_output.configure(yscrollincrement=get_font(size)[2])
+                update_scrollregion()
+                schedule_render()
+
+            def auto_fit_ascii_to_box(ascii_art: str):
+                """
+                Pick the largest font size whose *longest* line fits the viewer width,
+                using cached per-size metrics.
+                """
+                max_len = last_ascii["max_len"]
                 if max_len == 0:
                     return
 
-                # Make sure geometry info is up to date
-                root.update_idletasks()
-                box_width = text_output.winfo_width()
+                box_width = canvas_output.winfo_width()
                 if box_width <= 1:
                     return  # widget not ready yet
 
@@ -125,16 +733,13 @@ class AsciiArtConverterApp:
                 best_size = min_size
 
                 for size in range(max_size, min_size - 1, -1):
-                    ascii_font.configure(size=size)
-                    char_width = ascii_font.measure("M")  # monospaced, one char width
-                    total_width = char_width * max_len
+                    _, char_w, _ = get_font(size)
                     # small margin (10px)
-                    if total_width <= box_width - 10:
+                    if char_w * max_len <= box_width - 10:
                         best_size = size
                         break
 
-                ascii_font.configure(size=best_size)
-                text_output.configure(font=ascii_font)
+                set_font_size(best_size)
 
             def generate_ascii():
                 filepath = entry_file.get().strip()
@@ -152,6 +757,9 @@ class AsciiArtConverterApp:
                         messagebox.showerror("Error", "Width must be a positive integer.")
                         return
 
+                if not apply_render_options():
+                    return
+
                 try:
                     ascii_art = converter.image_file_to_ascii(filepath)
                 except FileNotFoundError:
@@ -161,16 +769,169 @@ class AsciiArtConverterApp:
                     messagebox.showerror("Error", str(e))
                     return
 
+                stop_playback()
+                show_ascii(ascii_art)
+
+            def apply_render_options():
+                """
+                Push filter / ramp / dither choices to the converter.
+                Returns False (after showing an error) if the ramp is invalid.
+                """
+                converter.set_resample(resample_var.get())
+                converter.set_dither(dither_var.get())
+                converter.set_engine(engine_var.get())
+                ramp = entry_ramp.get()
+                try:
+                    if ramp != render_state["ramp"]:
+                        converter.set_ramp(ramp or AsciiArtConverter.ASCII_CHARS)
+                        render_state["ramp"] = ramp
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e))
+                    return False
+                return True
+
+            def export_colored():
+                """
+                Export the selected image as ANSI truecolor (.ans), HTML or plain text.
+                """
+                filepath = entry_file.get().strip()
+                if not filepath:
+                    messagebox.showwarning("No file", "Please select an image file first.")
+                    return
+                if not apply_render_options():
+                    return
+
+                out_path = filedialog.asksaveasfilename(
+                    defaultextension=".html",
+                    filetypes=[
+                        ("HTML", "*.html"),
+                        ("ANSI truecolor text", "*.ans"),
+                        ("Plain text", "*.txt"),
+                    ],
+                    title="Export ASCII art"
+                )
+                if not out_path:
+                    return
+
+                try:
+                    converter.export_file(filepath, out_path)
+                    messagebox.showinfo("Export", f"Exported to:\n{out_path}")
+                except Exception as e:
+                    messagebox.showerror("Export error", str(e))
+
+            def show_ascii(ascii_art: str, refit: bool = True):
+                lines = ascii_art.splitlines()
                 last_ascii["text"] = ascii_art
+                last_ascii["lines"] = lines
+                last_ascii["max_len"] = max((len(line) for line in lines), default=0)
+
+                if refit:
+                    canvas_output.xview_moveto(0)
+                    canvas_output.yview_moveto(0)
+                    update_scrollregion()
+                    root.update_idletasks()  # make sure the viewer has its real size
+                    auto_fit_ascii_to_box(ascii_art)
+                schedule_render()
+
+            def play_frames():
+                """
+                Load a frames archive (from batch mode) or an animated image
+                and stream it at the FPS from the entry field.
+                """
+                path = filedialog.askopenfilename(
+                    filetypes=[
+                        ("Frames / animations", "*.zip;*.gif;*.webp"),
+                        ("All files", "*.*"),
+                    ]
+                )
+                if not path:
+                    return
+
+                try:
+                    fps = float(entry_fps.get().strip())
+                    if fps <= 0:
+                        raise ValueError
+                except ValueError:
+                    messagebox.showerror("Error", "FPS must be a positive number.")
+                    return
 
-                text_output.config(state="normal")
-                text_output.delete("1.0", tk.END)
-                text_output.insert(tk.END, ascii_art)
-                text_output.config(state="disabled")
+                width_text = entry_width.get().strip()
+                if width_text.isdigit():
+                    converter.set_width(int(width_text))
+                if not apply_render_options():
+                    return
 
-                auto_fit_ascii_to_box(ascii_art)
+                stop_playback()
+                # a fresh list per playback: a worker still filling an old one is ignored
+                frames = []
+                playback["frames"] = frames
+                playback["loading"] = True
+                playback["error"] = None
+                playback["fps"] = fps
+                playback["start"] = time.perf_counter()
+                playback["shown"] = -1
 
-            # Zoom buttons now just call auto-fit on current ASCII
+                if path.lower().endswith(".zip"):
+                    try:
+                        frames.extend(text for text, _ in load_frames_archive(path))
+                    except Exception as e:
+                        playback["loading"] = False
+                        messagebox.showerror("Error", str(e))
+                        return
+                    playback["loading"] = False
+                else:
+                    # convert off the Tk thread; playback starts with the first frame
+                    # (with a snapshot of the converter, so option changes meanwhile don't mix in)
+                    threading.Thread(target=load_frames, args=(copy.copy(converter), path, frames),
+                                     daemon=True).start()
+                playback["after_id"] = root.after(0, playback_tick)
+
+            def load_frames(frame_converter, path, frames):
+                # worker thread: only appends to `frames` and sets flags, the
+                # Tk thread picks them up in playback_tick
+                try:
+                    for text, _ in frame_converter.frames_to_ascii(path):
+                        if playback["frames"] is not frames:
+                            return  # playback replaced or stopped
+                        frames.append(text)
+                except Exception as e:
+                    if playback["frames"] is frames:
+                        playback["error"] = str(e)
+                finally:
+                    if playback["frames"] is frames:
+                        playback["loading"] = False
+
+            def playback_tick():
+                # frame index follows wall-clock time, so slow frames are skipped
+                frames = playback["frames"]
+                if playback["error"]:
+                    playback["after_id"] = None
+                    messagebox.showerror("Error", playback["error"])
+                    return
+                index = int((time.perf_counter() - playback["start"]) * playback["fps"])
+                if index >= len(frames):
+                    if not playback["loading"]:
+                        playback["after_id"] = None
+                        return
+                    if not frames:
+                        playback["start"] = time.perf_counter()  # wait for the first frame
+                    else:
+                        # conversion is behind: hold the newest frame instead of skipping ahead
+                        index = len(frames) - 1
+                        playback["start"] = time.perf_counter() - index / playback["fps"]
+                if frames and index != playback["shown"]:
+                    show_ascii(frames[index], refit=playback["shown"] < 0)
+                    playback["shown"] = index
+                playback["after_id"] = root.after(int(1000 / playback["fps"]), playback_tick)
+
+            def stop_playback():
+                if playback["after_id"] is not None:
+                    root.after_cancel(playback["after_id"])
+                    playback["after_id"] = None
+                playback["frames"] = []  # detaches a running loader
+                playback["loading"] = False
+
+            # Zoom buttons only change the font size; text is never re-inserted
             def zoom_out():
                 # re-fit font based on current box size and current ASCII
                 if last_ascii["text"]:
@@ -178,8 +939,19 @@ class AsciiArtConverterApp:
 
             def zoom_in():
                 # optional: just reset to a “normal” size
-                ascii_font.configure(size=10)
-                text_output.configure(font=ascii_font)
+                set_font_size(10)
+
+            def scroll_x(*args):
+                canvas_output.xview(*args)
+                schedule_render()
+
+            def scroll_y(*args):
+                canvas_output.yview(*args)
+                schedule_render()
+
+            def on_mousewheel(event):
+                canvas_output.yview_scroll(-1 if event.delta > 0 else 1, "units")
+                schedule_render()
 
             # Blank "Save Program" button placeholder, does nothing
             def save_program_placeholder():
@@ -203,6 +975,27 @@ class AsciiArtConverterApp:
             entry_width.pack(side="left", padx=5)
             entry_width.insert(0, "80")  # default
 
+            tk.Label(frame_width, text="Filter:").pack(side="left", padx=(15, 0))
+            resample_var = tk.StringVar(master=root, value=converter.resample)
+            tk.OptionMenu(frame_width, resample_var, *AsciiArtConverter.RESAMPLE_FILTERS).pack(side="left", padx=5)
+
+            tk.Label(frame_width, text="Engine:").pack(side="left", padx=(15, 0))
+            engine_var = tk.StringVar(master=root, value=converter.engine)
+            tk.OptionMenu(frame_width, engine_var, *AsciiArtConverter.ENGINES).pack(side="left", padx=5)
+
+            tk.Label(frame_width, text="Dither:").pack(side="left", padx=(15, 0))
+            dither_var = tk.StringVar(master=root, value=converter.dither)
+            tk.OptionMenu(frame_width, dither_var, *AsciiArtConverter.DITHER_MODES).pack(side="left", padx=5)
+
+            tk.Label(frame_width, text="Ramp:").pack(side="left", padx=(15, 0))
+            entry_ramp = tk.Entry(frame_width, width=14)  # empty = default, "auto" = generated
+            entry_ramp.pack(side="left", padx=5)
+
+            tk.Label(frame_width, text="FPS:").pack(side="left", padx=(15, 0))
+            entry_fps = tk.Entry(frame_width, width=5)
+            entry_fps.pack(side="left", padx=5)
+            entry_fps.insert(0, "12")  # default
+
             # Buttons row
             frame_buttons = tk.Frame(root)
             frame_buttons.pack(padx=10, pady=10, fill="x")
@@ -212,6 +1005,10 @@ class AsciiArtConverterApp:
             tk.Button(frame_buttons, text="Refit to Box", command=zoom_out).pack(side="left", padx=5)
             tk.Button(frame_buttons, text="Reset Font", command=zoom_in).pack(side="left", padx=5)
 
+            tk.Button(frame_buttons, text="Export...", command=export_colored).pack(side="left", padx=5)
+            tk.Button(frame_buttons, text="Play Frames...", command=play_frames).pack(side="left", padx=5)
+            tk.Button(frame_buttons, text="Stop", command=stop_playback).pack(side="left", padx=5)
+
             tk.Button(
                 frame_buttons,
                 text="Save Program",
@@ -222,24 +1019,33 @@ class AsciiArtConverterApp:
             frame_output = tk.Frame(root)
             frame_output.pack(padx=10, pady=10, fill="both", expand=True)
 
-            text_output = tk.Text(frame_output, wrap="none", state="disabled")
-            text_output.pack(fill="both", expand=True)
-            text_output.configure(font=ascii_font)
-
             # Scrollbars (still useful if height is big)
-            scroll_y = tk.Scrollbar(frame_output, orient="vertical", command=text_output.yview)
-            scroll_y.pack(side="right", fill="y")
-            text_output.config(yscrollcommand=scroll_y.set)
+            scrollbar_y = tk.Scrollbar(frame_output, orient="vertical", command=scroll_y)
+            scrollbar_y.pack(side="right", fill="y")
+
+            scrollbar_x = tk.Scrollbar(frame_output, orient="horizontal", command=scroll_x)
+            scrollbar_x.pack(side="bottom", fill="x")
 
-            scroll_x = tk.Scrollbar(frame_output, orient="horizontal", command=text_output.xview)
-            scroll_x.pack(side="bottom", fill="x")
-            text_output.config(xscrollcommand=scroll_x.set)
+            # viewport canvas: only visible rows/columns are drawn (see render_visible)
+            canvas_output = tk.Canvas(frame_output, bg="white", highlightthickness=0,
+                                      xscrollcommand=scrollbar_x.set,
+                                      yscrollcommand=scrollbar_y.set)
+            canvas_output.pack(fill="both", expand=True)
+            canvas_output.configure(yscrollincrement=get_font(view["size"])[2])
+
+            canvas_output.bind("<Configure>", schedule_render)
+            canvas_output.bind("<MouseWheel>", on_mousewheel)
+            canvas_output.bind("<Button-4>", lambda _e: scroll_y("scroll", -1, "units"))
+            canvas_output.bind("<Button-5>", lambda _e: scroll_y("scroll", 1, "units"))
 
             root.mainloop()
 
         main()
 
 
-# Support direct script execution
+# Support direct script execution: no arguments -> GUI, otherwise batch CLI
 if __name__ == "__main__":
-    AsciiArtConverterApp().run()
+    if len(sys.argv) > 1:
+        main()
+    else:
+        AsciiArtConverterApp().run()
@@ -0,0 +1,93 @@
+import math
+import time
+from collections import deque
+
+
+def ease_factor(per_tick, ticks):
+    """
+    Fraction to move toward a goal over `ticks` (float) nominal frames when a
+    single frame moves `per_tick` of the way: 1 - (1 - per_tick) ** ticks.
+    Exponential easing that ends up at the same place at any frame rate.
+    """
+    return 1.0 - (1.0 - per_tick) ** ticks
+
+
+class FrameScheduler:
+    """
+    Frame loop for Tk animations driven by time.perf_counter deltas instead of
+    a fixed `after(16)` per tick:
+    - callback(dt) gets the seconds since the previous frame (capped at MAX_DT)
+      and returns True while the scene still changes, False when it is static;
+      a static scene stops the loop until wake() is called
+    - frames are scheduled against deadlines; when a frame overruns, the missed
+      deadlines are skipped (counted in `skipped`) instead of queued, and the
+      next dt simply covers the lost time
+    - fps / percentiles() report the measured rate over the last HISTORY frames
+    """
+
+    MAX_DT = 0.25  # s; longer gaps (window dragged, debugger) count as one slow frame
+    HISTORY = 240
+
+    def __init__(self, widget, callback, target_fps=60):
+        self.widget = widget
+        self.callback = callback
+        self.interval = 1.0 / target_fps
+        self.frame_times = deque(maxlen=self.HISTORY)
+        self.frames = 0
+        self.skipped = 0
+        self._after_id = None
+        self._last = None
+        self._deadline = None
+
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def wake(self):
+        """Start (or keep) the loop running; the first frame gets dt = 0."""
+        if self._after_id is None:
+            self._last = time.perf_counter()
+            self._deadline = self._last
+            self._after_id = self.widget.after_idle(self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        dt = min(now - self._last, self.MAX_DT)
+        if self.frames:
+            self.frame_times.append(now - self._last)
+        self._last = now
+        self.frames += 1
+
+        if not self.callback(dt):
+            self._after_id = None  # static: idle until wake()
+            return
+
+        self._deadline += self.interval
+        now = time.perf_counter()
+        if now > self._deadline:
+            missed = math.ceil((now - self._deadline) / self.interval)
+            self.skipped += missed
+            self._deadline += missed * self.interval
+        delay_ms = max(1, round((self._deadline - now) * 1000))
+        self._after_id = self.widget.after(delay_ms, self._tick)
+
+    @property
+    def fps(self):
+        total = sum(self.frame_times)
+        return len(self.frame_times) / total if total > 0 else 0.0
+
+    def percentiles(self, ps=(50, 95, 99)):
+        """Frame times in ms at the given percentiles (nearest rank) over the history."""
+        times = sorted(self.frame_times)
+        if not times:
+            return {p: 0.0 for p in ps}
+        return {p: times[min(len(times) - 1, max(0, math.ceil(p / 100 * len(times)) - 1))] * 1000 for p in ps}
+
+    def summary(self):
+        p = self.percentiles()
+        return f"{self.fps:5.1f} fps  p50 {p[50]:5.1f} ms  p95 {p[95]:5.1f} ms  p99 {p[99]:5.1f} ms"
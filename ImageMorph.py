@@ -1,30 +1,723 @@
 import os
+import sys
 import math
-import random
 import time
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageTk
 
+from FrameScheduler import FrameScheduler, ease_factor
+
+
+def _hilbert_index(coords, bits):
+    """
+    Position of each point along a Hilbert curve (Skilling's transpose
+    algorithm, vectorized over points). `coords` is (N, dims) with integer
+    values in [0, 2**bits); nearby indices mean nearby points.
+    """
+    coords = np.asarray(coords)
+    n = coords.shape[1]
+    x = [coords[:, i].astype(np.uint64) for i in range(n)]
+    one = np.uint64(1)
+    m = np.uint64(1 << (bits - 1))
+
+    # inverse undo
+    q = m
+    while q > one:
+        p = q - one
+        for i in range(n):
+            high = (x[i] & q) != 0
+            x[0] = np.where(high, x[0] ^ p, x[0])
+            t = np.where(high, np.uint64(0), (x[0] ^ x[i]) & p)
+            x[0] ^= t
+            x[i] ^= t
+        q >>= one
+
+    # Gray encode
+    for i in range(1, n):
+        x[i] ^= x[i - 1]
+    t = np.zeros_like(x[0])
+    q = m
+    while q > one:
+        t = np.where((x[n - 1] & q) != 0, t ^ (q - one), t)
+        q >>= one
+    for i in range(n):
+        x[i] ^= t
+
+    # interleave the transposed bits into one index
+    index = np.zeros_like(x[0])
+    for b in range(bits - 1, -1, -1):
+        for i in range(n):
+            index = (index << one) | ((x[i] >> np.uint64(b)) & one)
+    return index
+
+
+class MorphParticles:
+    """
+    Particle state of a morph as NumPy arrays, one row per block:
+    current / target / chaos_target positions (N, 2) and colors (N, 3).
+    step() advances every particle in one vectorized operation.
+    """
+
+    CHAOS_LERP = 0.02
+    SETTLE_LERP = 0.05
+    SETTLE_EPS = 0.5  # px; closer than this on both axes counts as settled
+
+    def __init__(self, current, target, chaos_target, colors, size):
+        self.current = np.array(current, dtype=np.float64)
+        self.target = np.asarray(target, dtype=np.float64)
+        self.chaos_target = np.asarray(chaos_target, dtype=np.float64)
+        self.colors = np.asarray(colors, dtype=np.uint8)
+        self.size = size
+
+    def __len__(self):
+        return len(self.current)
+
+    def step(self, chaos: bool, ticks=1.0) -> bool:
+        """
+        Move every particle toward its chaos target (chaos phase) or its final
+        target by the eased fraction for `ticks` nominal frames (a fixed lerp
+        per frame when ticks == 1). Returns True once all are settled.
+        """
+        goal = self.chaos_target if chaos else self.target
+        lerp = self.CHAOS_LERP if chaos else self.SETTLE_LERP
+        if ticks != 1.0:
+            lerp = ease_factor(lerp, ticks)
+        self.current += (goal - self.current) * lerp
+        return bool((np.abs(goal - self.current) <= self.SETTLE_EPS).all())
+
+    def positions_after(self, chaos_steps, settle_steps):
+        """
+        Positions after the given number of chaos and then settle steps,
+        starting from `current`, in closed form (each phase is a geometric
+        decay toward its goal) so any frame can be computed independently.
+        """
+        pos = self.chaos_target + (self.current - self.chaos_target) * (1.0 - self.CHAOS_LERP) ** chaos_steps
+        if settle_steps:
+            pos = self.target + (pos - self.target) * (1.0 - self.SETTLE_LERP) ** settle_steps
+        return pos
+
+    def rasterize(self, frame, background=0, positions=None):
+        """
+        Draw all particles as size x size squares into an (H, W, 3) uint8
+        frame buffer in place, at `positions` (default: current). Later
+        particles overwrite earlier ones, like canvas stacking order;
+        particles (partly) outside the frame are dropped.
+        """
+        height, width = frame.shape[:2]
+        frame[...] = background
+        s = self.size
+        positions = self.current if positions is None else positions
+        xs = np.rint(positions[:, 0]).astype(np.intp)
+        ys = np.rint(positions[:, 1]).astype(np.intp)
+        colors = self.colors
+
+        inside = (xs >= 0) & (ys >= 0) & (xs <= width - s) & (ys <= height - s)
+        if not inside.all():
+            xs, ys, colors = xs[inside], ys[inside], colors[inside]
+
+        flat = frame.reshape(-1, 3)
+        base = ys * width + xs
+        for dy in range(s):
+            for dx in range(s):
+                flat[base + (dy * width + dx)] = colors
+        return frame
+
+
+class MatchCache:
+    """
+    On-disk LRU cache of block matchings, one memory-mapped .npy per image
+    pair, fitted size, block size and strategy. Each entry is a record array
+    (assignment, inverse assignment, source block RGB, target block RGB)
+    stored for the pair in content-hash order; load() returns views into the
+    map for either direction, so a hit copies nothing. Least recently used
+    entries are evicted once the directory exceeds max_bytes.
+    """
+
+    DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "pixel_morph")
+    MAX_BYTES = 256 * 1024 * 1024
+    DTYPE = np.dtype([("assign", "<i4"), ("inverse", "<i4"), ("src", "u1", 3), ("tgt", "u1", 3)])
+    VERSION = 3  # part of the key; bump when DTYPE or a matching changes
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or self.DIRECTORY
+        self.max_bytes = max_bytes or self.MAX_BYTES
+
+    @staticmethod
+    def image_hash(image):
+        h = hashlib.sha256()
+        h.update(f"{image.mode}{image.size}".encode("ascii"))
+        h.update(image.tobytes())
+        return h.hexdigest()
+
+    def key(self, source_hash, target_hash, size, block_size, block_color, strategy, seed):
+        """Returns (key, reversed): reversed means the entry is stored target -> source."""
+        first, second = sorted((source_hash, target_hash))
+        text = f"v{self.VERSION}|{first}|{second}|{size[0]}x{size[1]}|{block_size}|{block_color}|{strategy}|{seed}"
+        return hashlib.sha256(text.encode("ascii")).hexdigest()[:32], source_hash != first
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npy")
+
+    def load(self, key, reverse=False):
+        """
+        (assignment, src_colors, tgt_colors) for `key` as read-only views
+        into the memory map (int32 / (N, 3) uint8), or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            table = np.load(path, mmap_mode="r")
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        if table.dtype != self.DTYPE:
+            return None
+        if reverse:
+            return table["inverse"], table["tgt"], table["src"]
+        return table["assign"], table["src"], table["tgt"]
+
+    def store(self, key, assignment, src_colors, tgt_colors, reverse=False):
+        count = len(assignment)
+        inverse = np.empty(count, dtype=np.int32)
+        inverse[assignment] = np.arange(count)
+        if reverse:
+            assignment, inverse, src_colors, tgt_colors = inverse, assignment, tgt_colors, src_colors
+        table = np.empty(count, dtype=self.DTYPE)
+        table["assign"] = assignment
+        table["inverse"] = inverse
+        table["src"] = src_colors[:count]
+        table["tgt"] = tgt_colors[:count]
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = path + ".part"
+        try:
+            with open(tmp, "wb") as f:
+                np.save(f, table)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return  # caching is best effort
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+class PixelMorph:
+    """
+    Tk-free morph core: block extraction, color matching, particle setup and
+    the frame timeline. Used by PixelMorphApp and by the headless export.
+    """
 
-class PixelMorphApp(tk.Toplevel):
     BLOCK_SIZE = 2
-    MAX_BLOCKS = 5500  # cap rendered rectangles to avoid UI freeze/crash
+    BLOCK_SIZES = (1, 2, 3, 4, 6, 8)
+    MAX_BLOCKS = 250_000
     INITIAL_DELAY_MS = 2000
     CHAOS_DURATION_MS = 2000
     TIMER_INTERVAL_MS = 16  # ~60 fps similar to the C# sample
     CHAOS_SPREAD = 50  # pixel jitter around target to add mild motion
+    MARGIN = 100
+    BLOCK_COLOR = "mean"  # "mean" = average color of each block, "sample" = its top-left pixel
+    # source -> target color assignment, see match_blocks()
+    MATCH_STRATEGIES = ("sliced", "hilbert", "luminance", "greedy")
+    MATCH_STRATEGY = "sliced"
+    SLICED_ITERATIONS = 16
+    COARSE_FACTOR = 4  # coarse-to-fine: coarse cells are COARSE_FACTOR x COARSE_FACTOR blocks
+    CALIBRATION_START = 4096
+    CALIBRATION_HEADROOM = 0.75  # share of a frame the particles may use; Tk needs the rest
+
+    def __init__(self, strategy=None, seed=None, cache=None, block_size=None, coarse_to_fine=False):
+        self.strategy = strategy or self.MATCH_STRATEGY
+        self.seed = seed
+        self.cache = cache  # optional MatchCache
+        self.block_size = self.BLOCK_SIZE if block_size is None else block_size
+        self.coarse_to_fine = coarse_to_fine
+
+    @property
+    def block_size(self):
+        return self._block_size
+
+    @block_size.setter
+    def block_size(self, value):
+        # checked on every assignment: the app sets it from its menu per start
+        if int(value) != value or value < 1:
+            raise ValueError(f"Block size must be a whole number of at least 1, got {value!r}.")
+        self._block_size = int(value)
+
+    def prepare(self, source, target, max_blocks=None):
+        """
+        Fit both images to the block budget (source resized to the target
+        size), match their blocks and place the particles. Returns
+        (particles, (canvas_width, canvas_height)) with the source on the left
+        and the target on the right, like the app window. With a cache, a
+        repeated (or reversed) pair skips resizing and matching.
+        """
+        width, height = self.fit_size_to_limit(*target.size, max_blocks=max_blocks)
+
+        cached = key = None
+        if self.cache is not None:
+            key, reverse = self.cache.key(
+                MatchCache.image_hash(source), MatchCache.image_hash(target), (width, height),
+                self.block_size, self.BLOCK_COLOR, self._match_key(), self.seed)
+            cached = self.cache.load(key, reverse)
+
+        if cached is not None:
+            assignment, src_colors, _ = cached
+        else:
+            if (width, height) != target.size:
+                target = target.resize((width, height), Image.LANCZOS)
+            source = source.resize((width, height), Image.LANCZOS)
+            _, src_colors = self.get_blocks(source)
+            _, tgt_colors = self.get_blocks(target)
+            if self.coarse_to_fine:
+                assignment = self.match_coarse_to_fine(source, target, src_colors, tgt_colors)
+            else:
+                assignment = self.match_blocks(src_colors, tgt_colors, strategy=self.strategy, seed=self.seed)
+            if key is not None:
+                self.cache.store(key, assignment, src_colors, tgt_colors, reverse)
+
+        coords = self.block_coords(width, height)  # same grid for both images
+        margin = self.MARGIN
+        count = len(assignment)
+        start_pos = coords[assignment] + (margin, margin)
+        target_pos = coords[:count] + (width + margin * 2, margin)
+        rng = np.random.default_rng(self.seed)
+        chaos = target_pos + rng.integers(-self.CHAOS_SPREAD, self.CHAOS_SPREAD + 1, size=(count, 2))
+
+        particles = MorphParticles(
+            current=start_pos,
+            target=target_pos,
+            chaos_target=chaos,
+            colors=src_colors[assignment],
+            size=self.block_size,
+        )
+        return particles, (width * 2 + margin * 3, height + margin * 2)
+
+    def timeline(self, particles):
+        """
+        The app's timer ticks for a fresh morph as a list of
+        (chaos_steps, settle_steps) per tick, tick k being shown at
+        k * TIMER_INTERVAL_MS: still during INITIAL_DELAY_MS, chaos steps until
+        CHAOS_DURATION_MS later, then settle steps until every particle is
+        settled.
+        """
+        interval = self.TIMER_INTERVAL_MS
+        chaos_end = self.INITIAL_DELAY_MS + self.CHAOS_DURATION_MS
+        ticks = [(0, 0)]
+        chaos_steps = 0
+        t = interval
+        while t < chaos_end:
+            if t >= self.INITIAL_DELAY_MS:
+                chaos_steps += 1
+            ticks.append((chaos_steps, 0))
+            t += interval
+
+        # the settle phase is a geometric decay, so its length has a closed form
+        gap = np.abs(particles.positions_after(chaos_steps, 0) - particles.target).max(initial=0.0)
+        settle_steps = 1
+        if gap > particles.SETTLE_EPS:
+            settle_steps = math.ceil(math.log(particles.SETTLE_EPS / gap) / math.log(1.0 - particles.SETTLE_LERP))
+        ticks.extend((chaos_steps, k) for k in range(1, settle_steps + 1))
+        return ticks
+
+    def get_blocks(self, img, mode=None, block_size=None):
+        """
+        Split an RGB image into block_size blocks (row-major, edge blocks may be partial).
+        Returns (coords, colors): top-left (x, y) per block as an (N, 2) int32
+        array and the block color as an (N, 3) uint8 array, either the block
+        mean or the top-left pixel depending on `mode` (default BLOCK_COLOR).
+        """
+        mode = mode or self.BLOCK_COLOR
+        pixels = np.asarray(img.convert("RGB"), dtype=np.uint8)
+        h, w = pixels.shape[:2]
+        step = block_size or self.block_size
+
+        ys = np.arange(0, h, step)
+        xs = np.arange(0, w, step)
+        coords = self.block_coords(w, h, step)
+
+        if mode == "sample":
+            colors = pixels[::step, ::step]
+        else:
+            # exact per-block sums (partial edge blocks included), divided by block areas
+            sums = np.add.reduceat(np.add.reduceat(pixels.astype(np.uint32), ys, axis=0), xs, axis=1)
+            areas = np.outer(np.diff(np.append(ys, h)), np.diff(np.append(xs, w)))
+            colors = np.rint(sums / areas[:, :, np.newaxis]).astype(np.uint8)
+
+        return coords, colors.reshape(-1, 3)
+
+    def block_coords(self, width, height, block_size=None):
+        """Top-left (x, y) of every block of a width x height image, row-major, as (N, 2) int32."""
+        step = block_size or self.block_size
+        grid_x, grid_y = np.meshgrid(np.arange(0, width, step), np.arange(0, height, step))
+        return np.stack([grid_x.ravel(), grid_y.ravel()], axis=1).astype(np.int32)
+
+    def match_blocks(self, src_colors, tgt_colors, strategy=None, seed=None):
+        """
+        Assign every target block a distinct source block of similar color.
+        Returns an int array `assignment` with assignment[target_idx] = source_idx.
+        Strategies (default MATCH_STRATEGY):
+        - "sliced":    sliced optimal transport (source colors are moved onto the
+                       target distribution along random 1D projections), then
+                       paired along a Hilbert curve; best quality, O(n log n)
+        - "hilbert":   pair both sets in Hilbert-curve order of their RGB colors
+        - "luminance": pair both sets sorted by luminance
+        - "greedy":    nearest unused source color per target; O(n^2), small n only
+        """
+        strategy = strategy or self.MATCH_STRATEGY
+        count = min(len(src_colors), len(tgt_colors))
+        src_colors = np.asarray(src_colors[:count], dtype=np.int32)
+        tgt_colors = np.asarray(tgt_colors[:count], dtype=np.int32)
+
+        if strategy == "greedy":
+            return self._match_greedy(src_colors, tgt_colors)
+        if strategy == "luminance":
+            weights = np.array([0.299, 0.587, 0.114])
+            return self._pair_by_order(src_colors @ weights, tgt_colors @ weights)
+        if strategy == "hilbert":
+            return self._pair_by_order(_hilbert_index(src_colors, 8), _hilbert_index(tgt_colors, 8))
+        if strategy == "sliced":
+            moved = self._sliced_transport(src_colors, tgt_colors, np.random.default_rng(seed))
+            return self._pair_by_order(
+                _hilbert_index(np.clip(np.rint(moved), 0, 255), 8),
+                _hilbert_index(tgt_colors, 8),
+            )
+        raise ValueError(f"Unknown matching strategy: {strategy}")
+
+    def _match_key(self):
+        # strategy as recorded in the match cache key
+        if self.coarse_to_fine:
+            return f"{self.strategy}+c2f{self.COARSE_FACTOR}"
+        return self.strategy
+
+    def match_coarse_to_fine(self, source, target, src_colors, tgt_colors):
+        """
+        Match COARSE_FACTOR x COARSE_FACTOR cells of blocks first (with the
+        selected strategy, on far fewer points), then refine locally: the
+        blocks of every source cell go to the blocks of its matched target
+        cell, paired in Hilbert order of their colors. Partial edge cells can
+        hold fewer blocks than their partner; each pair of cells is matched up
+        to the smaller count and the leftovers on both sides are matched with
+        match_blocks. Both images must have the same size. Keeps neighbouring
+        blocks moving together.
+        """
+        coarse_size = self.block_size * self.COARSE_FACTOR
+        _, coarse_src = self.get_blocks(source, block_size=coarse_size)
+        _, coarse_tgt = self.get_blocks(target, block_size=coarse_size)
+        coarse = self.match_blocks(coarse_src, coarse_tgt, strategy=self.strategy, seed=self.seed)
+        cell_dest = np.empty(len(coarse), dtype=np.intp)
+        cell_dest[coarse] = np.arange(len(coarse))  # source cell -> target cell
+
+        width, height = target.size
+        coords = self.block_coords(width, height)
+        cols = math.ceil(width / coarse_size)
+        cells = (coords[:, 1] // coarse_size) * cols + coords[:, 0] // coarse_size
+
+        # sort both sides by (target cell, color curve position) and rank
+        # every block within its group
+        src_groups = cell_dest[cells]
+        src_order = np.lexsort((_hilbert_index(src_colors, 8), src_groups))
+        tgt_order = np.lexsort((_hilbert_index(tgt_colors, 8), cells))
+        n_cells = len(coarse)
+        src_rank = self._rank_in_group(src_groups[src_order], n_cells)
+        tgt_rank = self._rank_in_group(cells[tgt_order], n_cells)
+
+        # pair the k-th source and target block of each cell while both have one
+        limit = np.minimum(np.bincount(src_groups, minlength=n_cells), np.bincount(cells, minlength=n_cells))
+        src_keep = src_rank < limit[src_groups[src_order]]
+        tgt_keep = tgt_rank < limit[cells[tgt_order]]
+        assignment = np.empty(len(tgt_colors), dtype=np.intp)
+        assignment[tgt_order[tgt_keep]] = src_order[src_keep]  # same (cell, rank) order on both sides
+
+        src_left = src_order[~src_keep]
+        tgt_left = tgt_order[~tgt_keep]
+        if len(tgt_left):
+            rest = self.match_blocks(src_colors[src_left], tgt_colors[tgt_left],
+                                     strategy=self.strategy, seed=self.seed)
+            assignment[tgt_left] = src_left[rest]
+        return assignment
+
+    @staticmethod
+    def _rank_in_group(sorted_groups, n_groups):
+        # position of every element within its run of equal group ids
+        starts = np.searchsorted(sorted_groups, np.arange(n_groups))
+        return np.arange(len(sorted_groups)) - starts[sorted_groups]
+
+    @staticmethod
+    def _pair_by_order(src_keys, tgt_keys):
+        # k-th smallest target gets the k-th smallest source
+        assignment = np.empty(len(tgt_keys), dtype=np.intp)
+        assignment[np.argsort(tgt_keys, kind="stable")] = np.argsort(src_keys, kind="stable")
+        return assignment
+
+    def _sliced_transport(self, src_colors, tgt_colors, rng):
+        """
+        Move a float copy of the source colors toward the target color
+        distribution: per random direction, sort both projections and shift
+        each source point by the gap to its rank-matched target.
+        """
+        moved = src_colors.astype(np.float64)
+        target = tgt_colors.astype(np.float64)
+        for _ in range(self.SLICED_ITERATIONS):
+            direction = rng.normal(size=3)
+            direction /= np.linalg.norm(direction)
+            proj_src = moved @ direction
+            proj_tgt = target @ direction
+            order_src = np.argsort(proj_src)
+            order_tgt = np.argsort(proj_tgt)
+            moved[order_src] += (proj_tgt[order_tgt] - proj_src[order_src])[:, np.newaxis] * direction
+        return moved
+
+    @staticmethod
+    def _match_greedy(src_colors, tgt_colors):
+        count = len(tgt_colors)
+        used = np.zeros(count, dtype=bool)
+        assignment = np.empty(count, dtype=np.intp)
+
+        for t_idx, tcol in enumerate(tgt_colors):
+            available = np.where(~used)[0]
+            diffs = src_colors[available] - tcol
+            dist2 = np.einsum("ij,ij->i", diffs, diffs)
+            best_local = int(available[int(np.argmin(dist2))])
+            used[best_local] = True
+            assignment[t_idx] = best_local
+
+        return assignment
+
+    def fit_size_to_limit(self, width, height, max_blocks=None):
+        """Scale (width, height) down, aligned to the block grid, to at most max_blocks blocks."""
+        limit = max_blocks or self.MAX_BLOCKS
+        blocks_w = math.ceil(width / self.block_size)
+        blocks_h = math.ceil(height / self.block_size)
+        blocks = max(1, blocks_w * blocks_h)
+        if blocks <= limit:
+            return width, height
+
+        scale = math.sqrt(limit / blocks)
+        new_w = max(self.block_size, int(width * scale))
+        new_h = max(self.block_size, int(height * scale))
+        # keep dimensions aligned to block grid
+        new_w = max(self.block_size, new_w - new_w % self.block_size)
+        new_h = max(self.block_size, new_h - new_h % self.block_size)
+        return new_w, new_h
+
+    def calibrate(self, blit=None, target_fps=60, limit=None, frames=5):
+        """
+        Largest particle count this machine animates at target_fps: time
+        step + rasterize (+ blit(frame), e.g. the Tk image update) on
+        synthetic morphs of doubling size, then one step between the last
+        count that fit into CALIBRATION_HEADROOM of a frame and the first that
+        did not. Returns a block count between CALIBRATION_START and `limit`
+        (default MAX_BLOCKS).
+        """
+        steps = self.calibration_steps(blit, target_fps, limit, frames)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                return done.value
 
-    class PixelObj:
-        def __init__(self, current, target, chaos_target, color, size, canvas_id=None):
-            self.current = list(current)
-            self.target = list(target)
-            self.chaos_target = list(chaos_target)
-            self.color = color
-            self.size = size
-            self.canvas_id = canvas_id
+    def calibration_steps(self, blit=None, target_fps=60, limit=None, frames=5):
+        """
+        Generator form of calibrate(): yields after every probed count, so a
+        UI can handle its events in between; returns the block count.
+        """
+        limit = limit or self.MAX_BLOCKS
+        budget = self.CALIBRATION_HEADROOM / target_fps
+        rng = np.random.default_rng(0)
+
+        def fits(count):
+            side = max(1, math.isqrt(count)) * self.block_size
+            width, height = side * 2 + self.MARGIN * 3, side + self.MARGIN * 2
+            start = rng.uniform(0, side, size=(count, 2)) + self.MARGIN
+            target = rng.uniform(0, side, size=(count, 2)) + (side + self.MARGIN * 2, self.MARGIN)
+            particles = MorphParticles(start, target, target, rng.integers(0, 256, size=(count, 3)), self.block_size)
+            frame = np.zeros((height, width, 3), dtype=np.uint8)
+            times = []
+            for _ in range(frames):
+                t = time.perf_counter()
+                particles.step(chaos=False)
+                particles.rasterize(frame)
+                if blit:
+                    blit(frame)
+                times.append(time.perf_counter() - t)
+            return sorted(times)[len(times) // 2] <= budget
+
+        good, count = 0, self.CALIBRATION_START
+        while count <= limit:
+            fit = fits(count)
+            yield
+            if not fit:
+                break
+            good, count = count, count * 2
+        if good == 0:
+            return min(limit, self.CALIBRATION_START)  # floor; slower machines just drop frames
+        if good < limit:
+            middle = min(limit, good * 3 // 2)
+            fit = fits(middle)
+            yield
+            if fit:
+                good = middle
+        return good
+
+
+# --------- headless export ---------
+
+EXPORT_FORMATS = ("gif", "webp", "png")
+FRAMES_PER_TASK = 8
+GIF_MIN_FRAME_MS = 20  # browsers play shorter GIF frame delays much slower
+
+# per-process render state, set once by _init_render_worker
+_render_state = {}
+
+
+def _init_render_worker(particles, canvas_size):
+    width, height = canvas_size
+    _render_state["particles"] = particles
+    _render_state["frame"] = np.zeros((height, width, 3), dtype=np.uint8)
+
+
+def _render_frames_task(ticks, fmt, paths=None):
+    """
+    Render the frames for a chunk of (chaos_steps, settle_steps) ticks.
+    PNG frames are written to `paths` directly; otherwise the images are
+    returned (palettized in the worker for GIF).
+    """
+    particles = _render_state["particles"]
+    frame = _render_state["frame"]
+    images = []
+    for i, (chaos_steps, settle_steps) in enumerate(ticks):
+        particles.rasterize(frame, positions=particles.positions_after(chaos_steps, settle_steps))
+        image = Image.fromarray(frame)
+        if paths:
+            image.save(paths[i], "PNG")
+            continue
+        if fmt == "gif":
+            image = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+        images.append(image)
+    return images
+
+
+def _ordered_results(pool, fn, tasks, window):
+    # like pool.map, but with at most `window` chunks rendered ahead of the writer
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+        pending.append(pool.submit(fn, *task))
+    while pending:
+        yield from pending.popleft().result()
+
+
+def export_morph(source_path, target_path, out, fmt=None, seed=0, workers=1, every=None,
+                 strategy=None, max_blocks=None, block_size=None, coarse_to_fine=False):
+    """
+    Render a morph without a window, deterministically for a given `seed`,
+    with the app's timing (INITIAL_DELAY_MS still, CHAOS_DURATION_MS chaos,
+    then settling at TIMER_INTERVAL_MS per tick).
+    fmt "gif"/"webp" writes one animated file to `out`; "png" writes
+    numbered frames "frame_00000.png" ... into the directory `out`.
+    Only every `every`-th tick becomes a frame (GIF: at least GIF_MIN_FRAME_MS).
+    `strategy`, `block_size` and `coarse_to_fine` are passed on to PixelMorph.
+    Returns the number of frames written.
+    """
+    fmt = (fmt or os.path.splitext(out)[1].lstrip(".") or "png").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    morph = PixelMorph(strategy=strategy, seed=seed, block_size=block_size, coarse_to_fine=coarse_to_fine)
+    if morph.strategy not in morph.MATCH_STRATEGIES:
+        raise ValueError(f"Unknown matching strategy: {morph.strategy}")
+    interval = morph.TIMER_INTERVAL_MS
+    every = 1 if every is None else every
+    if every < 1:
+        raise ValueError("every must be at least 1.")
+    if fmt == "gif":
+        every = max(every, math.ceil(GIF_MIN_FRAME_MS / interval))
+
+    with Image.open(source_path) as source, Image.open(target_path) as target:
+        particles, canvas_size = morph.prepare(source.convert("RGB"), target.convert("RGB"),
+                                               max_blocks=max_blocks)
+
+    ticks = morph.timeline(particles)
+    keep = list(range(0, len(ticks), every))
+    if keep[-1] != len(ticks) - 1:
+        keep.append(len(ticks) - 1)  # always end on the settled frame
+    ticks = [ticks[i] for i in keep]
+    durations = [(b - a) * interval for a, b in zip(keep, keep[1:])] + [every * interval]
+
+    paths = None
+    if fmt == "png":
+        os.makedirs(out, exist_ok=True)
+        paths = [os.path.join(out, f"frame_{i:05d}.png") for i in range(len(ticks))]
+    else:
+        # still stretches (initial delay) become one longer frame
+        merged_ticks, merged_durations = [], []
+        for tick, duration in zip(ticks, durations):
+            if merged_ticks and merged_ticks[-1] == tick:
+                merged_durations[-1] += duration
+            else:
+                merged_ticks.append(tick)
+                merged_durations.append(duration)
+        ticks, durations = merged_ticks, merged_durations
+
+    tasks = [
+        (ticks[i:i + FRAMES_PER_TASK], fmt, paths[i:i + FRAMES_PER_TASK] if paths else None)
+        for i in range(0, len(ticks), FRAMES_PER_TASK)
+    ]
+
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                                   initargs=(particles, canvas_size))
+        images = _ordered_results(pool, _render_frames_task, tasks, window=workers * 2)
+    else:
+        pool = None
+        _init_render_worker(particles, canvas_size)
+        images = (image for task in tasks for image in _render_frames_task(*task))
+    try:
+        if paths:
+            for _ in images:
+                pass  # frames are written by the workers
+        else:
+            first = next(images)
+            save_options = {"loop": 0, "duration": durations}
+            if fmt == "webp":
+                save_options["lossless"] = True
+            first.save(out, fmt.upper(), save_all=True, append_images=images, **save_options)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    return len(ticks)
+
+
+class PixelMorphApp(tk.Toplevel):
+    CANVAS_MAX_BLOCKS = 5500  # cap rendered rectangles to avoid UI freeze/crash
+    # "raster" draws every particle into one frame buffer blitted as a single
+    # PhotoImage; "canvas" keeps one rectangle item per block (slow, small morphs only)
+    RENDER_BACKENDS = ("raster", "canvas")
+    RENDER_BACKEND = "raster"
+    TARGET_FPS = 60
 
     def __init__(self, master=None):
         # Prefer the existing default root (calendar UI) if available.
@@ -44,12 +737,15 @@ class PixelMorphApp(tk.Toplevel):
         self.title("Pixel Morph Demo")
         self.resizable(False, False)
 
-        self.pixels = []
+        self.morph = PixelMorph(cache=MatchCache())
+        self.particles = None
+        self.canvas_ids = []
+        self.frame = None
+        self.photo = None
         self.start_time = None
-        self.margin = 100
-        self.animation_after_id = None
-        self.image_width = 0
-        self.image_height = 0
+        self.animation_after_id = None  # wake-up at the end of the initial delay
+        self.calibration_after_id = None  # next calibration probe
+        self.scheduler = FrameScheduler(self, self.update_animation)
 
         # UI
         control_frame = tk.Frame(self)
@@ -57,6 +753,13 @@ class PixelMorphApp(tk.Toplevel):
 
         self.source_path_var = tk.StringVar(master=self)
         self.target_path_var = tk.StringVar(master=self)
+        self.strategy_var = tk.StringVar(master=self, value=PixelMorph.MATCH_STRATEGY)
+        self.backend_var = tk.StringVar(master=self, value=self.RENDER_BACKEND)
+        self.stats_var = tk.StringVar(master=self)
+        self.block_size_var = tk.IntVar(master=self, value=PixelMorph.BLOCK_SIZE)
+        self.budget_var = tk.IntVar(master=self, value=0)  # 0 = calibrate on first start
+        self.coarse_var = tk.BooleanVar(master=self, value=False)
+        self.block_size_var.trace_add("write", self.on_block_size_change)
 
         tk.Label(control_frame, text="From:").grid(row=0, column=0, sticky="e")
         tk.Entry(control_frame, textvariable=self.source_path_var, width=50).grid(row=0, column=1, padx=5)
@@ -70,9 +773,25 @@ class PixelMorphApp(tk.Toplevel):
         button_frame.grid(row=2, column=0, columnspan=3, pady=8, sticky="w")
 
         tk.Button(button_frame, text="Start", command=self.start_morph).pack(side=tk.LEFT, padx=5)
+        tk.Label(button_frame, text="Matching:").pack(side=tk.LEFT, padx=(10, 0))
+        tk.OptionMenu(button_frame, self.strategy_var, *PixelMorph.MATCH_STRATEGIES).pack(side=tk.LEFT)
+        tk.Label(button_frame, text="Render:").pack(side=tk.LEFT, padx=(10, 0))
+        tk.OptionMenu(button_frame, self.backend_var, *self.RENDER_BACKENDS).pack(side=tk.LEFT)
         tk.Button(button_frame, text="Save Program", command=self.on_save_program).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Quit", command=self.destroy).pack(side=tk.LEFT, padx=5)
 
+        options_frame = tk.Frame(control_frame)
+        options_frame.grid(row=3, column=0, columnspan=3, sticky="w")
+
+        tk.Label(options_frame, text="Block size:").pack(side=tk.LEFT, padx=(5, 0))
+        tk.OptionMenu(options_frame, self.block_size_var, *PixelMorph.BLOCK_SIZES).pack(side=tk.LEFT)
+        tk.Label(options_frame, text="Particles:").pack(side=tk.LEFT, padx=(10, 0))
+        tk.Spinbox(options_frame, textvariable=self.budget_var, from_=0, to=PixelMorph.MAX_BLOCKS,
+                   increment=1000, width=8).pack(side=tk.LEFT)
+        tk.Button(options_frame, text="Calibrate", command=self.on_calibrate).pack(side=tk.LEFT, padx=5)
+        tk.Checkbutton(options_frame, text="Coarse-to-fine", variable=self.coarse_var).pack(side=tk.LEFT, padx=5)
+        tk.Label(options_frame, textvariable=self.stats_var, font=("Courier New", 9)).pack(side=tk.LEFT, padx=10)
+
         self.canvas = tk.Canvas(self, width=640, height=480, bg="black")
         self.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=False)
 
@@ -99,6 +818,53 @@ class PixelMorphApp(tk.Toplevel):
     def on_save_program(self):
         pass  # intentionally empty
 
+    def on_block_size_change(self, *_args):
+        # the budget is a particle count for one block size (larger blocks
+        # cost more to draw), so drop it and recalibrate on the next start
+        self._cancel_calibration()
+        self.budget_var.set(0)
+        self.stats_var.set("Block size changed: particles recalibrate on Start")
+
+    def on_calibrate(self, then=None):
+        """
+        Calibrate the particle budget for the current block size. The probes
+        time Tk image updates, so they run on this thread, but one per event
+        loop turn to keep the window responsive; `then` runs when done.
+        """
+        self._cancel_calibration()
+        self.morph.block_size = self.block_size_var.get()
+        self.stats_var.set("Calibrating...")
+
+        photos = {}
+
+        def blit(frame):
+            # time the Tk image update too, one PhotoImage per frame size
+            size = (frame.shape[1], frame.shape[0])
+            if size not in photos:
+                photos[size] = ImageTk.PhotoImage("RGB", size, master=self)
+            photos[size].paste(Image.fromarray(frame))
+
+        steps = self.morph.calibration_steps(blit=blit, target_fps=self.TARGET_FPS)
+
+        def advance():
+            self.calibration_after_id = None
+            try:
+                next(steps)
+            except StopIteration as done:
+                self.budget_var.set(done.value)
+                self.stats_var.set(f"{done.value} particles at {self.TARGET_FPS} fps")
+                if then is not None:
+                    then()
+                return
+            self.calibration_after_id = self.after(1, advance)
+
+        self.calibration_after_id = self.after(1, advance)
+
+    def _cancel_calibration(self):
+        if self.calibration_after_id is not None:
+            self.after_cancel(self.calibration_after_id)
+            self.calibration_after_id = None
+
     # --- main morphing logic ---
 
     def start_morph(self):
@@ -120,175 +886,153 @@ class PixelMorphApp(tk.Toplevel):
             messagebox.showerror("Error", f"Failed to load images:\n{e}")
             return
 
-        if self.animation_after_id:
-            self._stop_timer()
-
-        target_w, target_h = self._fit_size_to_limit(*target.size)
-        if (target_w, target_h) != target.size:
-            target = target.resize((target_w, target_h), Image.LANCZOS)
+        self._stop_timer()
 
-        # Resize source to match target
-        self.image_width, self.image_height = target_w, target_h
-        source = source.resize((self.image_width, self.image_height), Image.LANCZOS)
+        self.morph.strategy = self.strategy_var.get()
+        self.morph.block_size = self.block_size_var.get()
+        self.morph.coarse_to_fine = self.coarse_var.get()
+        if self.backend_var.get() == "canvas":
+            max_blocks = self.CANVAS_MAX_BLOCKS
+        else:
+            try:
+                max_blocks = self.budget_var.get()
+            except tk.TclError:
+                max_blocks = 0
+            if max_blocks <= 0:
+                self.on_calibrate(then=self.start_morph)  # starts again with the budget set
+                return
+        self.particles, (canvas_w, canvas_h) = self.morph.prepare(source, target, max_blocks=max_blocks)
 
-        # Resize canvas
-        canvas_w = self.image_width * 2 + self.margin * 3
-        canvas_h = self.image_height + self.margin * 2
         self.canvas.config(width=canvas_w, height=canvas_h)
         self.canvas.delete("all")
+        self.canvas_ids = []
+        self.frame = None
+        self.photo = None
 
-        # Get blocks
-        src_blocks = self.get_blocks(source)
-        tgt_blocks = self.get_blocks(target)
-
-        assignments = self.match_blocks(src_blocks, tgt_blocks)
-
-        rnd = random.Random()
-        self.pixels = []
-
-        for src_idx, tgt_idx in assignments:
-            (sx, sy), scol = src_blocks[src_idx]
-            (tx, ty), _ = tgt_blocks[tgt_idx]
-
-            start_pos = (sx + self.margin, sy + self.margin)
-            target_pos = (tx + self.image_width + self.margin * 2, ty + self.margin)
-
-            chaos = (
-                target_pos[0] + rnd.randint(-self.CHAOS_SPREAD, self.CHAOS_SPREAD),
-                target_pos[1] + rnd.randint(-self.CHAOS_SPREAD, self.CHAOS_SPREAD)
-            )
-
-            self.pixels.append(
-                self.PixelObj(
-                    current=start_pos,
-                    target=target_pos,
-                    chaos_target=chaos,
-                    color=scol,
-                    size=self.BLOCK_SIZE
-                )
-            )
-
-        self.create_canvas_items()
+        if self.backend_var.get() == "canvas":
+            self.create_canvas_items()
+        else:
+            self.create_raster_image(canvas_w, canvas_h)
         self.update_idletasks()
 
-        self.start_time = time.time()
-        self.animation_after_id = self.after(self.TIMER_INTERVAL_MS, self.update_animation)
+        self.start_time = time.perf_counter()
+        self.scheduler.wake()
 
     def run(self):
         # Only enter mainloop if we created our own hidden root.
         if self._owned_root is not None:
             self._owned_root.mainloop()
 
-    def get_blocks(self, img):
-        w, h = img.size
-        step = self.BLOCK_SIZE
-        blocks = []
-        for y in range(0, h, step):
-            for x in range(0, w, step):
-                blocks.append(((x, y), img.getpixel((x, y))))
-        return blocks
-
-    def match_blocks(self, src_blocks, tgt_blocks):
-        # Greedy nearest-color assignment: for each target block, find closest unused source color.
-        count = min(len(src_blocks), len(tgt_blocks))
-        src_blocks = src_blocks[:count]
-        tgt_blocks = tgt_blocks[:count]
-
-        src_colors = np.array([c for (_, c) in src_blocks], dtype=np.int16)
-        tgt_colors = np.array([c for (_, c) in tgt_blocks], dtype=np.int16)
-
-        used = np.zeros(count, dtype=bool)
-        assignments = []
-
-        for t_idx, tcol in enumerate(tgt_colors):
-            available = np.where(~used)[0]
-            if len(available) == 0:
-                break
-            diffs = src_colors[available] - tcol
-            dist2 = np.einsum("ij,ij->i", diffs, diffs)
-            best_local = int(available[int(np.argmin(dist2))])
-            used[best_local] = True
-            assignments.append((best_local, t_idx))
-
-        return assignments
-
     # --- canvas handling ---
 
     def create_canvas_items(self):
-        for px in self.pixels:
-            x, y = px.current
-            s = px.size
-            r, g, b = px.color
+        s = self.particles.size
+        self.canvas_ids = []
+        for (x, y), (r, g, b) in zip(self.particles.current.tolist(), self.particles.colors.tolist()):
             col = f"#{r:02x}{g:02x}{b:02x}"
-            px.canvas_id = self.canvas.create_rectangle(
+            self.canvas_ids.append(self.canvas.create_rectangle(
                 x, y, x + s, y + s, fill=col, outline=col
-            )
+            ))
 
-    # --- animation loop ---
+    def create_raster_image(self, width, height):
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.photo = ImageTk.PhotoImage("RGB", (width, height), master=self)
+        self.canvas.create_image(0, 0, anchor="nw", image=self.photo)
+        self.draw_raster()
 
-    def update_animation(self):
-        elapsed_ms = (time.time() - self.start_time) * 1000.0
+    def draw_raster(self):
+        self.particles.rasterize(self.frame)
+        self.photo.paste(Image.fromarray(self.frame))
 
-        if elapsed_ms < self.INITIAL_DELAY_MS:
-            self.animation_after_id = self.after(self.TIMER_INTERVAL_MS, self.update_animation)
+    def draw_particles(self):
+        if self.frame is not None:
+            self.draw_raster()
             return
 
-        chaos_phase_end = self.INITIAL_DELAY_MS + self.CHAOS_DURATION_MS
-        all_settled = True
-
-        for px in self.pixels:
-            if elapsed_ms < chaos_phase_end:
-                lerp = 0.02
-                tx, ty = px.chaos_target
-            else:
-                lerp = 0.05
-                tx, ty = px.target
+        # canvas backend: only the Tk calls remain per item
+        s = self.particles.size
+        coords = self.canvas.coords
+        for item, (x, y) in zip(self.canvas_ids, self.particles.current.tolist()):
+            coords(item, x, y, x + s, y + s)
 
-            px.current[0] += (tx - px.current[0]) * lerp
-            px.current[1] += (ty - px.current[1]) * lerp
+    # --- animation loop ---
 
-            dx = abs(tx - px.current[0])
-            dy = abs(ty - px.current[1])
-            if dx > 0.5 or dy > 0.5:
-                all_settled = False
+    def update_animation(self, dt):
+        """Scheduler callback; returns False while nothing moves."""
+        elapsed_ms = (time.perf_counter() - self.start_time) * 1000.0
 
-            if px.canvas_id is not None:
-                s = px.size
-                self.canvas.coords(px.canvas_id, px.current[0], px.current[1], px.current[0] + s, px.current[1] + s)
+        morph = self.morph
+        if elapsed_ms < morph.INITIAL_DELAY_MS:
+            # static until the delay is over: idle instead of redrawing
+            remaining = math.ceil(morph.INITIAL_DELAY_MS - elapsed_ms)
+            self.animation_after_id = self.after(remaining, self._end_delay)
+            return False
 
-        if all_settled and elapsed_ms >= chaos_phase_end:
-            self._stop_timer()
-            return
+        chaos_phase_end = morph.INITIAL_DELAY_MS + morph.CHAOS_DURATION_MS
+        ticks = dt * 1000.0 / morph.TIMER_INTERVAL_MS
+        all_settled = self.particles.step(chaos=elapsed_ms < chaos_phase_end, ticks=ticks)
+        self.draw_particles()
 
-        self.animation_after_id = self.after(self.TIMER_INTERVAL_MS, self.update_animation)
+        done = all_settled and elapsed_ms >= chaos_phase_end
+        if done or self.scheduler.frames % 30 == 0:
+            self.stats_var.set(self.scheduler.summary())
+        return not done
 
-    def _fit_size_to_limit(self, width, height):
-        blocks_w = math.ceil(width / self.BLOCK_SIZE)
-        blocks_h = math.ceil(height / self.BLOCK_SIZE)
-        blocks = max(1, blocks_w * blocks_h)
-        if blocks <= self.MAX_BLOCKS:
-            return width, height
-
-        scale = math.sqrt(self.MAX_BLOCKS / blocks)
-        new_w = max(self.BLOCK_SIZE, int(width * scale))
-        new_h = max(self.BLOCK_SIZE, int(height * scale))
-        # keep dimensions aligned to block grid
-        new_w = max(self.BLOCK_SIZE, new_w - new_w % self.BLOCK_SIZE)
-        new_h = max(self.BLOCK_SIZE, new_h - new_h % self.BLOCK_SIZE)
-        return new_w, new_h
+    def _end_delay(self):
+        self.animation_after_id = None
+        self.scheduler.wake()
 
     def _stop_timer(self):
+        self.scheduler.stop()
         if self.animation_after_id is not None:
             self.after_cancel(self.animation_after_id)
             self.animation_after_id = None
 
     def _on_close(self):
         self._stop_timer()
+        self._cancel_calibration()
         self.destroy()
         if self._owned_root is not None:
             self._owned_root.destroy()
             self._owned_root = None
 
 
+def main(argv=None):
+    """
+    Command line entry point for headless export, e.g.:
+        python ImageMorph.py from.png to.png -o morph.gif --seed 7 --workers 4
+        python ImageMorph.py from.png to.png -o frames/ --format png
+    """
+    parser = argparse.ArgumentParser(description="Render a pixel morph to GIF/WebP or PNG frames.")
+    parser.add_argument("source", help="image the morph starts from")
+    parser.add_argument("target", help="image the morph ends at")
+    parser.add_argument("-o", "--out", required=True, help="output .gif/.webp file or PNG frame directory")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="default: from the output extension, else png")
+    parser.add_argument("--seed", type=int, default=0, help="seed for matching and chaos jitter")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="render processes")
+    parser.add_argument("--every", type=int, help="keep every n-th animation tick as a frame")
+    parser.add_argument("--strategy", choices=PixelMorph.MATCH_STRATEGIES, default=PixelMorph.MATCH_STRATEGY)
+    parser.add_argument("--max-blocks", type=int, default=PixelMorph.MAX_BLOCKS,
+                        help="scale the images down to at most this many blocks")
+    parser.add_argument("--block-size", type=int, default=PixelMorph.BLOCK_SIZE, help="block edge in pixels")
+    parser.add_argument("--coarse-to-fine", action="store_true",
+                        help="match coarse cells first, then the blocks inside them")
+    args = parser.parse_args(argv)
+
+    try:
+        start = time.perf_counter()
+        count = export_morph(args.source, args.target, args.out, fmt=args.format, seed=args.seed,
+                             workers=args.workers, every=args.every, strategy=args.strategy,
+                             max_blocks=args.max_blocks, block_size=args.block_size,
+                             coarse_to_fine=args.coarse_to_fine)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    print(f"Wrote {count} frame(s) in {time.perf_counter() - start:.2f}s")
+
+
+# Support direct script execution: no arguments -> GUI, otherwise headless export
 if __name__ == "__main__":
-    PixelMorphApp().run()
+    if len(sys.argv) > 1:
+        main()
+    else:
+        PixelMorphApp().run()
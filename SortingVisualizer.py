@@ -2,6 +2,145 @@ import tkinter as tk
 from tkinter import messagebox
 import tkinter.font as tkfont
 import random
+import threading
+import time
+from array import array
+
+
+class OpCounter:
+    """
+    Operations a sort performs on `values`: compare(i, j) is reported before
+    the algorithm compares those elements itself, swap(i, j) and write(i, v)
+    change the list. Only counts them, so a run measures the algorithm
+    without recording (see SortingVisualizer.benchmark).
+    """
+
+    MAX_OPS = 5_000_000
+
+    def __init__(self, data, max_ops=None):
+        self.values = list(data)
+        self.max_ops = max_ops or self.MAX_OPS
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+
+    @property
+    def operations(self):
+        return self.comparisons + self.swaps + self.writes
+
+    def _check_limit(self):
+        if self.operations >= self.max_ops:
+            raise ValueError(
+                f"More than {self.max_ops:,} steps; use fewer elements or a faster algorithm.")
+
+    def compare(self, i, j):
+        self._check_limit()
+        self.comparisons += 1
+
+    def swap(self, i, j):
+        self._check_limit()
+        values = self.values
+        values[i], values[j] = values[j], values[i]
+        self.swaps += 1
+
+    def write(self, i, value):
+        self._check_limit()
+        self.values[i] = value
+        self.writes += 1
+
+    def summary(self):
+        return f"comparisons: {self.comparisons:,}  swaps: {self.swaps:,}  writes: {self.writes:,}"
+
+
+class SortTrace(OpCounter):
+    """
+    Compact record of a sort: every compare / swap / write is also logged in
+    typed arrays instead of copying the list at every step. States are
+    rebuilt on demand from keyframes (a snapshot every `interval` operations).
+
+    Step 0 is the initial data, step k the state after operation k with its
+    indices highlighted, and the last step the sorted result:
+        trace[k] -> (data, highlight_indices)
+    """
+
+    COMPARE, SWAP, WRITE = 0, 1, 2
+    KEYFRAME_MIN = 1024
+
+    def __init__(self, data, max_ops=None):
+        super().__init__(data, max_ops)
+        # keyframes cost about as much memory as the operations between them
+        self.interval = max(self.KEYFRAME_MIN, len(self.values))
+        self.kinds = array("b")
+        self.first = array("i")
+        self.second = array("i")
+        self.keyframes = [array("i", self.values)]
+        self._pos = 0
+        self._state = array("i", self.values)
+
+    # ---- recording ----
+
+    def _log(self, kind, i, j):
+        count = len(self.kinds)
+        self.kinds.append(kind)
+        self.first.append(i)
+        self.second.append(j)
+        if (count + 1) % self.interval == 0:
+            self.keyframes.append(array("i", self.values))
+
+    def compare(self, i, j):
+        super().compare(i, j)
+        self._log(self.COMPARE, i, j)
+
+    def swap(self, i, j):
+        super().swap(i, j)
+        self._log(self.SWAP, i, j)
+
+    def write(self, i, value):
+        super().write(i, value)
+        self._log(self.WRITE, i, value)
+
+    # ---- playback ----
+
+    def __len__(self):
+        return len(self.kinds) + 2
+
+    def _apply(self, state, k):
+        kind, i, j = self.kinds[k], self.first[k], self.second[k]
+        if kind == self.SWAP:
+            state[i], state[j] = state[j], state[i]
+        elif kind == self.WRITE:
+            state[i] = j
+
+    def _seek(self, pos):
+        """Make _state the data after the first `pos` operations."""
+        state = self._state
+        if pos < self._pos and self._pos - pos <= self.interval and self.WRITE not in self.kinds[pos:self._pos]:
+            # compares and swaps undo themselves
+            for k in range(self._pos - 1, pos - 1, -1):
+                self._apply(state, k)
+        else:
+            if not (self._pos <= pos <= self._pos + self.interval):
+                base = pos // self.interval
+                state[:] = self.keyframes[base]
+                self._pos = base * self.interval
+            for k in range(self._pos, pos):
+                self._apply(state, k)
+        self._pos = pos
+
+    def __getitem__(self, step):
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError("step out of range")
+        ops = len(self.kinds)
+        if step == 0 or step > ops:
+            self._seek(0 if step == 0 else ops)
+            return list(self._state), (-1, -1)
+        self._seek(step)
+        k = step - 1
+        if self.kinds[k] == self.WRITE:
+            return list(self._state), (self.first[k], -1)
+        return list(self._state), (self.first[k], self.second[k])
 
 
 class SortingVisualizer:
@@ -9,75 +148,338 @@ class SortingVisualizer:
     Generates data, records sorting steps, and renders ASCII bar states.
     """
 
+    MAX_LENGTH = 100_000
+    RENDER_MAX_ROWS = 200  # longer lists are shown as a window around the highlight
+    # display name -> step recorder
+    ALGORITHMS = {
+        "Bubble Sort": "bubble_sort_steps",
+        "Insertion Sort": "insertion_sort_steps",
+        "Selection Sort": "selection_sort_steps",
+        "Merge Sort": "merge_sort_steps",
+        "Quicksort (Lomuto)": "quicksort_lomuto_steps",
+        "Quicksort (Hoare)": "quicksort_hoare_steps",
+        "Heapsort": "heapsort_steps",
+        "Shell Sort": "shell_sort_steps",
+        "Radix Sort": "radix_sort_steps",
+        "Timsort (runs)": "timsort_steps",
+    }
+    SHELL_GAPS = (1, 4, 10, 23, 57, 132, 301, 701)  # Ciura; extended by x2.25
+    RADIX = 10
+    MIN_RUN = 32
+    BENCHMARK_MAX_OPS = 200_000_000  # stops quadratic sorts on huge inputs
+
     def __init__(self):
         self.data = []
 
     def generate_data(self, length: int, min_val: int = 1, max_val: int = 100):
         if length <= 0:
             raise ValueError("Length must be positive.")
-        if length > 100:
-            raise ValueError("Length too large; max is 100 for readability.")
+        if length > self.MAX_LENGTH:
+            raise ValueError(f"Length too large; max is {self.MAX_LENGTH}.")
         self.data = [random.randint(min_val, max_val) for _ in range(length)]
 
-    # ---- Sorting algorithms: yield states (data snapshot, highlight_indices) ----
+    # ---- Sorting algorithms: record compare/swap/write operations on a SortTrace ----
 
-    def bubble_sort_steps(self):
-        arr = self.data.copy()
+    def bubble_sort_steps(self, trace):
+        arr = trace.values
         n = len(arr)
-        # initial state
-        yield arr.copy(), (-1, -1)
         for i in range(n):
             for j in range(0, n - i - 1):
-                # state: comparing j and j+1
-                yield arr.copy(), (j, j + 1)
+                trace.compare(j, j + 1)
                 if arr[j] > arr[j + 1]:
-                    arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                    # state after swap
-                    yield arr.copy(), (j, j + 1)
-        # final state
-        yield arr.copy(), (-1, -1)
-
-    def insertion_sort_steps(self):
-        arr = self.data.copy()
+                    trace.swap(j, j + 1)
+
+    def insertion_sort_steps(self, trace):
+        arr = trace.values
         n = len(arr)
-        yield arr.copy(), (-1, -1)
         for i in range(1, n):
             key = arr[i]
             j = i - 1
-            # highlight current key
-            yield arr.copy(), (i, j)
-            while j >= 0 and arr[j] > key:
-                arr[j + 1] = arr[j]
+            while j >= 0:
+                trace.compare(j, j + 1)
+                if arr[j] <= key:
+                    break
+                trace.write(j + 1, arr[j])
                 j -= 1
-                yield arr.copy(), (j, j + 1)
-            arr[j + 1] = key
-            yield arr.copy(), (j + 1, i)
-        yield arr.copy(), (-1, -1)
+            if j + 1 != i:
+                trace.write(j + 1, key)
 
-    def selection_sort_steps(self):
-        arr = self.data.copy()
+    def selection_sort_steps(self, trace):
+        arr = trace.values
         n = len(arr)
-        yield arr.copy(), (-1, -1)
         for i in range(n):
             min_idx = i
             for j in range(i + 1, n):
-                yield arr.copy(), (min_idx, j)
+                trace.compare(min_idx, j)
                 if arr[j] < arr[min_idx]:
                     min_idx = j
-                    yield arr.copy(), (min_idx, j)
-            arr[i], arr[min_idx] = arr[min_idx], arr[i]
-            yield arr.copy(), (i, min_idx)
-        yield arr.copy(), (-1, -1)
+            if min_idx != i:
+                trace.swap(i, min_idx)
+
+    def _merge(self, trace, lo, mid, hi):
+        # stable merge of the sorted ranges [lo, mid) and [mid, hi) via a copy
+        arr = trace.values
+        aux = arr[lo:mid]
+        i, j, k = lo, mid, lo
+        while i < mid and j < hi:
+            trace.compare(i, j)
+            if aux[i - lo] <= arr[j]:
+                trace.write(k, aux[i - lo])
+                i += 1
+            else:
+                trace.write(k, arr[j])
+                j += 1
+            k += 1
+        while i < mid:
+            trace.write(k, aux[i - lo])
+            i += 1
+            k += 1
+        # a leftover right part is already in place
+
+    def merge_sort_steps(self, trace):
+        # bottom-up: merge neighbouring runs of width 1, 2, 4, ...
+        n = len(trace.values)
+        width = 1
+        while width < n:
+            for lo in range(0, n - width, 2 * width):
+                self._merge(trace, lo, lo + width, min(lo + 2 * width, n))
+            width *= 2
+
+    def _median_of_three(self, trace, lo, hi):
+        # order arr[lo] <= arr[mid] <= arr[hi] and return mid
+        arr = trace.values
+        mid = (lo + hi) // 2
+        for a, b in ((lo, mid), (mid, hi), (lo, mid)):
+            trace.compare(a, b)
+            if arr[b] < arr[a]:
+                trace.swap(a, b)
+        return mid
+
+    def quicksort_lomuto_steps(self, trace):
+        arr = trace.values
+        stack = [(0, len(arr) - 1)]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = self._median_of_three(trace, lo, hi)
+            if hi - lo < 3:
+                continue  # sorted by the median-of-three
+            trace.swap(mid, hi)
+            pivot = arr[hi]
+            i = lo
+            for j in range(lo, hi):
+                trace.compare(j, hi)
+                if arr[j] < pivot:
+                    if i != j:
+                        trace.swap(i, j)
+                    i += 1
+            if i != hi:
+                trace.swap(i, hi)
+            # smaller side last, so it is handled first and the stack stays O(log n)
+            left, right = (lo, i - 1), (i + 1, hi)
+            stack.extend((left, right) if i - lo > hi - i else (right, left))
+
+    def quicksort_hoare_steps(self, trace):
+        arr = trace.values
+        stack = [(0, len(arr) - 1)]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = self._median_of_three(trace, lo, hi)
+            if hi - lo < 3:
+                continue
+            # park the pivot at hi (like Lomuto), so both scans are logged
+            # against its slot; arr[hi] stops the i scan, arr[lo] <= pivot the j scan
+            trace.swap(mid, hi)
+            pivot = arr[hi]
+            i, j = lo - 1, hi
+            while True:
+                i += 1
+                trace.compare(i, hi)
+                while arr[i] < pivot:
+                    i += 1
+                    trace.compare(i, hi)
+                j -= 1
+                trace.compare(j, hi)
+                while arr[j] > pivot:
+                    j -= 1
+                    trace.compare(j, hi)
+                if i >= j:
+                    break
+                trace.swap(i, j)
+            if i != hi:
+                trace.swap(i, hi)
+            left, right = (lo, i - 1), (i + 1, hi)
+            stack.extend((left, right) if i - lo > hi - i else (right, left))
+
+    def heapsort_steps(self, trace):
+        arr = trace.values
+        n = len(arr)
+
+        def sift_down(root, end):
+            while True:
+                child = 2 * root + 1
+                if child >= end:
+                    return
+                if child + 1 < end:
+                    trace.compare(child, child + 1)
+                    if arr[child] < arr[child + 1]:
+                        child += 1
+                trace.compare(root, child)
+                if arr[root] >= arr[child]:
+                    return
+                trace.swap(root, child)
+                root = child
+
+        for start in range(n // 2 - 1, -1, -1):
+            sift_down(start, n)
+        for end in range(n - 1, 0, -1):
+            trace.swap(0, end)
+            sift_down(0, end)
+
+    def shell_sort_steps(self, trace):
+        arr = trace.values
+        n = len(arr)
+        gaps = list(self.SHELL_GAPS)
+        while gaps[-1] * 2.25 < n:
+            gaps.append(int(gaps[-1] * 2.25))
+        for gap in reversed(gaps):
+            if gap >= n:
+                continue
+            # insertion sort over every gap-th element
+            for i in range(gap, n):
+                key = arr[i]
+                j = i
+                while j >= gap:
+                    trace.compare(j - gap, j)
+                    if arr[j - gap] <= key:
+                        break
+                    trace.write(j, arr[j - gap])
+                    j -= gap
+                if j != i:
+                    trace.write(j, key)
+
+    def radix_sort_steps(self, trace):
+        # LSD radix sort: one stable bucket pass per digit, no comparisons
+        arr = trace.values
+        if not arr:
+            return
+        if min(arr) < 0:
+            raise ValueError("Radix sort needs non-negative values.")
+        base = self.RADIX
+        place = 1
+        while place <= max(arr):
+            buckets = [[] for _ in range(base)]
+            for value in arr:
+                buckets[value // place % base].append(value)
+            k = 0
+            for bucket in buckets:
+                for value in bucket:
+                    if arr[k] != value:
+                        trace.write(k, value)
+                    k += 1
+            place *= base
+
+    def timsort_steps(self, trace):
+        """
+        Timsort-style: find natural runs (strictly descending ones reversed),
+        extend short runs to MIN_RUN by insertion sort, and merge runs from a
+        stack that keeps Timsort's length invariants. No galloping.
+        """
+        arr = trace.values
+        n = len(arr)
+        runs = []  # (start, length)
+
+        def merge_at(idx):
+            start_a, len_a = runs[idx]
+            _, len_b = runs[idx + 1]
+            self._merge(trace, start_a, start_a + len_a, start_a + len_a + len_b)
+            runs[idx:idx + 2] = [(start_a, len_a + len_b)]
+
+        lo = 0
+        while lo < n:
+            hi = lo + 1
+            if hi == n:
+                hi = lo  # single trailing element
+            else:
+                trace.compare(lo, hi)
+                if arr[hi] < arr[lo]:
+                    while hi + 1 < n:
+                        trace.compare(hi, hi + 1)
+                        if arr[hi + 1] >= arr[hi]:
+                            break
+                        hi += 1
+                    a, b = lo, hi
+                    while a < b:
+                        trace.swap(a, b)
+                        a += 1
+                        b -= 1
+                else:
+                    while hi + 1 < n:
+                        trace.compare(hi, hi + 1)
+                        if arr[hi + 1] < arr[hi]:
+                            break
+                        hi += 1
+            end = hi + 1
+
+            # extend to MIN_RUN with insertion sort
+            target = min(n, lo + self.MIN_RUN)
+            while end < target:
+                key = arr[end]
+                j = end
+                while j > lo:
+                    trace.compare(j - 1, j)
+                    if arr[j - 1] <= key:
+                        break
+                    trace.write(j, arr[j - 1])
+                    j -= 1
+                if j != end:
+                    trace.write(j, key)
+                end += 1
+
+            runs.append((lo, end - lo))
+            lo = end
+
+            # restore the invariants |A| > |B| + |C| and |B| > |C| on the stack top
+            while len(runs) > 1:
+                k = len(runs) - 2
+                if k > 0 and runs[k - 1][1] <= runs[k][1] + runs[k + 1][1]:
+                    merge_at(k - 1 if runs[k - 1][1] < runs[k + 1][1] else k)
+                elif runs[k][1] <= runs[k + 1][1]:
+                    merge_at(k)
+                else:
+                    break
+
+        while len(runs) > 1:
+            merge_at(len(runs) - 2)
 
     def get_steps(self, algorithm: str):
-        if algorithm == "Bubble Sort":
-            return list(self.bubble_sort_steps())
-        elif algorithm == "Insertion Sort":
-            return list(self.insertion_sort_steps())
-        elif algorithm == "Selection Sort":
-            return list(self.selection_sort_steps())
-        else:
+        """Record `algorithm` on a copy of the data; returns the SortTrace."""
+        if algorithm not in self.ALGORITHMS:
             raise ValueError(f"Unknown algorithm: {algorithm}")
+        trace = SortTrace(self.data)
+        getattr(self, self.ALGORITHMS[algorithm])(trace)
+        return trace
+
+    def benchmark(self, algorithm: str):
+        """
+        Run `algorithm` on a copy of the data without recording steps.
+        Returns the OpCounter (exact comparisons / swaps / writes) and the
+        wall-clock seconds, which include the counting overhead.
+        Raises ValueError past BENCHMARK_MAX_OPS operations.
+        """
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        data = list(self.data)  # the UI runs this in a thread; new data must not interfere
+        counter = OpCounter(data, max_ops=self.BENCHMARK_MAX_OPS)
+        start = time.perf_counter()
+        getattr(self, self.ALGORITHMS[algorithm])(counter)
+        seconds = time.perf_counter() - start
+        if counter.values != sorted(data):
+            raise RuntimeError(f"{algorithm} did not sort the data.")
+        return counter, seconds
 
     # ---- ASCII rendering ----
 
@@ -85,6 +487,8 @@ class SortingVisualizer:
         """
         Render the list of numbers as horizontal ASCII bars.
         Highlight two indices (if provided) with a '>' marker.
+        Lists longer than RENDER_MAX_ROWS show only the rows around the
+        first highlighted index.
         """
         if not data:
             return "(no data)"
@@ -93,11 +497,19 @@ class SortingVisualizer:
         lines = []
         hi_set = set(idx for idx in highlight_indices if 0 <= idx < len(data))
 
+        start = 0
+        if len(data) > self.RENDER_MAX_ROWS:
+            focus = min(hi_set) if hi_set else 0
+            start = max(0, min(focus - self.RENDER_MAX_ROWS // 2, len(data) - self.RENDER_MAX_ROWS))
+            stop = start + self.RENDER_MAX_ROWS
+            lines.append(f"  rows {start}-{stop - 1} of {len(data)}")
+            data = data[start:stop]
+
         # scale bars to max width (30 chars)
         max_bar_width = 30
         scale = max_bar_width / max_val if max_val > 0 else 1
 
-        for idx, val in enumerate(data):
+        for idx, val in enumerate(data, start):
             bar_len = max(1, int(val * scale))
             bar = "#" * bar_len
             prefix = "> " if idx in hi_set else "  "
@@ -120,7 +532,8 @@ class SortingVisualizerApp:
 
             ascii_font = tkfont.Font(family="Courier", size=10)
 
-            current_steps = []
+            # recorded SortTrace (indexable like a list of steps)
+            recorded = {"steps": []}
             current_index = {"value": 0}
             is_playing = {"value": False}
             delay_ms = {"value": 150}
@@ -150,7 +563,7 @@ class SortingVisualizerApp:
                 text_output.insert(tk.END, ascii_state)
                 text_output.config(state="disabled")
 
-                current_steps.clear()
+                recorded["steps"] = []
                 current_index["value"] = 0
                 is_playing["value"] = False
 
@@ -166,20 +579,56 @@ class SortingVisualizerApp:
                     messagebox.showerror("Error", str(e))
                     return
 
-                current_steps.clear()
-                current_steps.extend(steps)
+                recorded["steps"] = steps
                 current_index["value"] = 0
                 is_playing["value"] = False
+                label_stats.config(text=f"{algo}: {steps.summary()}")
 
                 show_current_step()
 
+            def run_benchmark():
+                algo = algo_var.get()
+                if not visualizer.data:
+                    messagebox.showwarning("No data", "Generate data first.")
+                    return
+
+                # a slow sort on large data takes seconds: run it in a worker
+                # thread and poll for the result, so the window keeps responding
+                size = len(visualizer.data)
+                result = {}
+
+                def work():
+                    try:
+                        result["value"] = visualizer.benchmark(algo)
+                    except ValueError as e:
+                        result["error"] = e
+
+                def poll():
+                    if worker.is_alive():
+                        root.after(50, poll)
+                        return
+                    btn_benchmark.config(state="normal")
+                    if "error" in result:
+                        label_stats.config(text="")
+                        messagebox.showerror("Error", str(result["error"]))
+                        return
+                    counter, seconds = result["value"]
+                    label_stats.config(
+                        text=f"{algo}: {seconds * 1000:.1f} ms for {size:,} elements  {counter.summary()}")
+
+                label_stats.config(text=f"{algo}: running...")
+                btn_benchmark.config(state="disabled")
+                worker = threading.Thread(target=work, daemon=True)
+                worker.start()
+                poll()
+
             def show_current_step():
-                if not current_steps:
+                if not recorded["steps"]:
                     return
                 idx = current_index["value"]
-                idx = max(0, min(idx, len(current_steps) - 1))
+                idx = max(0, min(idx, len(recorded["steps"]) - 1))
                 current_index["value"] = idx
-                data, hi = current_steps[idx]
+                data, hi = recorded["steps"][idx]
                 ascii_state = visualizer.render_ascii(data, hi)
 
                 text_output.config(state="normal")
@@ -187,37 +636,37 @@ class SortingVisualizerApp:
                 text_output.insert(tk.END, ascii_state)
                 text_output.config(state="disabled")
 
-                label_step.config(text=f"Step: {idx + 1} / {len(current_steps)}")
+                label_step.config(text=f"Step: {idx + 1} / {len(recorded['steps'])}")
 
             def next_step():
-                if not current_steps:
+                if not recorded["steps"]:
                     prepare_steps()
-                    if not current_steps:
+                    if not recorded["steps"]:
                         return
-                if current_index["value"] < len(current_steps) - 1:
+                if current_index["value"] < len(recorded["steps"]) - 1:
                     current_index["value"] += 1
                     show_current_step()
 
             def prev_step():
-                if not current_steps:
+                if not recorded["steps"]:
                     prepare_steps()
-                    if not current_steps:
+                    if not recorded["steps"]:
                         return
                 if current_index["value"] > 0:
                     current_index["value"] -= 1
                     show_current_step()
 
             def play_animation():
-                if not current_steps:
+                if not recorded["steps"]:
                     prepare_steps()
-                    if not current_steps:
+                    if not recorded["steps"]:
                         return
                 is_playing["value"] = True
 
                 def step_play():
                     if not is_playing["value"]:
                         return
-                    if current_index["value"] < len(current_steps) - 1:
+                    if current_index["value"] < len(recorded["steps"]) - 1:
                         current_index["value"] += 1
                         show_current_step()
                         root.after(delay_ms["value"], step_play)
@@ -262,12 +711,15 @@ class SortingVisualizerApp:
             # algorithm choice
             tk.Label(frame_top, text="Algorithm:").grid(row=0, column=3, padx=(20, 0), sticky="w")
             algo_var = tk.StringVar(value="Bubble Sort")
-            combo_algo = tk.OptionMenu(frame_top, algo_var, "Bubble Sort", "Insertion Sort", "Selection Sort")
+            combo_algo = tk.OptionMenu(frame_top, algo_var, *SortingVisualizer.ALGORITHMS)
             combo_algo.grid(row=0, column=4, padx=5)
 
             btn_prepare = tk.Button(frame_top, text="Prepare Steps", command=prepare_steps)
             btn_prepare.grid(row=0, column=5, padx=5)
 
+            btn_benchmark = tk.Button(frame_top, text="Benchmark", command=run_benchmark)
+            btn_benchmark.grid(row=0, column=6, padx=15)
+
             # delay
             tk.Label(frame_top, text="Delay (ms):").grid(row=1, column=0, sticky="w", pady=(8, 0))
             entry_delay = tk.Entry(frame_top, width=6)
@@ -296,6 +748,10 @@ class SortingVisualizerApp:
             label_step = tk.Label(root, text="Step: - / -")
             label_step.pack(pady=(0, 5))
 
+            # operation counters of the last recording / benchmark
+            label_stats = tk.Label(root, text="")
+            label_stats.pack(pady=(0, 5))
+
             # Output text area
             frame_output = tk.Frame(root)
             frame_output.pack(padx=10, pady=10, fill="both", expand=True)
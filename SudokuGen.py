@@ -3,25 +3,73 @@ from tkinter import messagebox, filedialog
 import random
 import copy
 import json
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ---- cell / unit lookup tables (flat index 0..80) ----
+
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+UNITS = (
+    [[r * 9 + c for c in range(9)] for r in range(9)]
+    + [[r * 9 + c for r in range(9)] for c in range(9)]
+    + [[(b // 3) * 27 + (b % 3) * 3 + r * 9 + c for r in range(3) for c in range(3)] for b in range(9)]
+)
+PEERS = [
+    sorted(set(UNITS[ROW_OF[i]] + UNITS[9 + COL_OF[i]] + UNITS[18 + BOX_OF[i]]) - {i})
+    for i in range(81)
+]
+ALL_DIGITS = 0x3FE  # bits 1..9 set
+
+DIFFICULTIES = ("easy", "medium", "hard", "expert")
 
 
 class SudokuGenerator:
     """
     Simple Sudoku board generator:
-    - generate_full_board(): returns a completed 9x9 grid
+    - generate_full_board(): returns a completed 9x9 grid, either by
+      backtracking or (fast_fill=True) by shuffling a canonical grid
     - generate_puzzle(blanks): returns a grid with some cells set to 0
-    Note: does NOT guarantee unique solution (simple generator).
+      Note: does NOT guarantee unique solution (simple generator).
+    - generate_unique_puzzle(difficulty): removes clues one at a time,
+      keeping only removals that leave exactly one solution, and aims
+      for the requested difficulty band (see grade_difficulty()).
+    - generate_from_id(puzzle_id): regenerates the exact puzzle described
+      by a compact "<seed>-<params>" identity (see make_puzzle_id()).
+    All randomness comes from the per-instance RNG `self.rng`.
     """
 
-    def __init__(self):
+    # backtracking nodes (beyond one per empty cell) above which a
+    # puzzle that needs guessing counts as "expert"
+    EXPERT_NODES = 300
+
+    def __init__(self, fast_fill: bool = False, seed=None):
         self.board = [[0 for _ in range(9)] for _ in range(9)]
+        self.fast_fill = fast_fill
+        self.rng = random.Random(seed)
 
-    def generate_full_board(self):
+    def reseed(self, seed):
         """
-        Generate a full valid Sudoku board using backtracking.
+        Restart the generator's RNG from `seed`.
         """
-        self.board = [[0 for _ in range(9)] for _ in range(9)]
-        self._fill_board()
+        self.rng.seed(seed)
+
+    def generate_full_board(self, fast: bool = None):
+        """
+        Generate a full valid Sudoku board.
+        By default uses backtracking; with fast=True (or fast_fill set on the
+        generator) it shuffles a canonical grid instead, which is constant-time.
+        """
+        if fast is None:
+            fast = self.fast_fill
+        if fast:
+            self.board = self._shuffled_board()
+        else:
+            self.board = [[0 for _ in range(9)] for _ in range(9)]
+            self._fill_board()
         return copy.deepcopy(self.board)
 
     def generate_puzzle(self, blanks: int = 40):
@@ -35,7 +83,7 @@ class SudokuGenerator:
 
         full = self.generate_full_board()   # self.board now = full solution
         cells = [(r, c) for r in range(9) for c in range(9)]
-        random.shuffle(cells)
+        self.rng.shuffle(cells)
 
         for i in range(blanks):
             r, c = cells[i]
@@ -44,8 +92,238 @@ class SudokuGenerator:
         # self.board is still the full solution (untouched copy from _fill_board)
         return full
 
+    def generate_unique_puzzle(self, difficulty: str = "medium", max_attempts: int = 20):
+        """
+        Generate a puzzle with exactly one solution, graded as `difficulty`.
+        Clues are removed one at a time in random order; a removal is undone
+        if it breaks uniqueness or pushes the grade above the target.
+        If no attempt hits the band exactly, the closest puzzle found is returned.
+        Returns the puzzle grid (with 0 as empty); self.board holds the solution.
+        """
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Difficulty must be one of: {', '.join(DIFFICULTIES)}.")
+
+        target = DIFFICULTIES.index(difficulty)
+        best = None  # (distance, puzzle, solution)
+
+        for _ in range(max_attempts):
+            solution = self.generate_full_board()
+            cells = [v for row in solution for v in row]
+            order = list(range(81))
+            self.rng.shuffle(order)
+
+            for i in order:
+                val = cells[i]
+                cells[i] = 0
+                if self.count_solutions(cells, limit=2)[0] != 1:
+                    cells[i] = val
+                    continue
+                if DIFFICULTIES.index(self.grade_difficulty(cells)) > target:
+                    cells[i] = val
+
+            puzzle = [cells[r * 9:r * 9 + 9] for r in range(9)]
+            distance = target - DIFFICULTIES.index(self.grade_difficulty(cells))
+            if best is None or distance < best[0]:
+                best = (distance, puzzle, solution)
+            if distance == 0:
+                break
+
+        _, puzzle, solution = best
+        self.board = solution
+        return copy.deepcopy(puzzle)
+
+    def generate_from_id(self, puzzle_id: str):
+        """
+        Reseed from a puzzle identity and regenerate that exact puzzle.
+        Returns the puzzle grid; self.board holds the solution.
+        """
+        seed, blanks, difficulty, fast = parse_puzzle_id(puzzle_id)
+        self.reseed(seed)
+        self.fast_fill = fast
+        if difficulty:
+            return self.generate_unique_puzzle(difficulty=difficulty)
+        return self.generate_puzzle(blanks=blanks)
+
+    def count_solutions(self, board, limit: int = 2):
+        """
+        Count solutions of `board` (9x9 grid or flat list of 81, 0 = empty),
+        stopping as soon as `limit` solutions are found.
+        Returns (count, search_nodes).
+        """
+        cells = self._flatten(board)
+        rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+        empties = []
+        for i, val in enumerate(cells):
+            if val == 0:
+                empties.append(i)
+                continue
+            bit = 1 << val
+            r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                return 0, 0  # clues already conflict
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+
+        state = {"count": 0, "nodes": 0}
+
+        def search():
+            state["nodes"] += 1
+            if not empties:
+                state["count"] += 1
+                return state["count"] >= limit
+
+            # pick the empty cell with the fewest candidates (MRV)
+            best_pos, best_mask, best_n = -1, 0, 10
+            for pos, i in enumerate(empties):
+                mask = ALL_DIGITS & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+                n = bin(mask).count("1")
+                if n < best_n:
+                    best_pos, best_mask, best_n = pos, mask, n
+                    if n <= 1:
+                        break
+            if best_n == 0:
+                return False
+
+            i = empties[best_pos]
+            empties[best_pos] = empties[-1]
+            empties.pop()
+            r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+            mask = best_mask
+            done = False
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+                done = search()
+                rows[r] ^= bit
+                cols[c] ^= bit
+                boxes[b] ^= bit
+                if done:
+                    break
+            empties.append(i)
+            empties[best_pos], empties[-1] = empties[-1], empties[best_pos]
+            return done
+
+        search()
+        return state["count"], state["nodes"]
+
+    def grade_difficulty(self, board):
+        """
+        Grade a puzzle by the techniques needed to solve it:
+        - "easy":   naked singles only
+        - "medium": also needs hidden singles
+        - "hard":   needs guessing, with a small search tree
+        - "expert": needs guessing, more than EXPERT_NODES extra search nodes
+        """
+        cells = self._flatten(board)
+        cand = [0] * 81
+        for i, val in enumerate(cells):
+            if val == 0:
+                used = 0
+                for unit in (UNITS[ROW_OF[i]], UNITS[9 + COL_OF[i]], UNITS[18 + BOX_OF[i]]):
+                    for j in unit:
+                        used |= 1 << cells[j]
+                cand[i] = ALL_DIGITS & ~used
+
+        def place(i, val):
+            cells[i] = val
+            cand[i] = 0
+            bit = ~(1 << val)
+            for unit in (UNITS[ROW_OF[i]], UNITS[9 + COL_OF[i]], UNITS[18 + BOX_OF[i]]):
+                for j in unit:
+                    cand[j] &= bit
+
+        used_hidden = False
+        progress = True
+        while progress:
+            progress = False
+            # naked singles: a cell with only one candidate left
+            for i in range(81):
+                mask = cand[i]
+                if mask and mask & (mask - 1) == 0:
+                    place(i, mask.bit_length() - 1)
+                    progress = True
+            if progress:
+                continue
+            # hidden singles: a digit with only one place left in a unit
+            for unit in UNITS:
+                for val in range(1, 10):
+                    bit = 1 << val
+                    spots = [j for j in unit if cand[j] & bit]
+                    if len(spots) == 1:
+                        place(spots[0], val)
+                        used_hidden = True
+                        progress = True
+                        break
+                if progress:
+                    break
+
+        if 0 not in cells:
+            return "medium" if used_hidden else "easy"
+
+        original = self._flatten(board)
+        _, nodes = self.count_solutions(original, limit=2)
+        extra = nodes - original.count(0)
+        return "expert" if extra > self.EXPERT_NODES else "hard"
+
     # ----- internal helpers -----
 
+    def _flatten(self, board):
+        if len(board) == 81:
+            return list(board)
+        return [v for row in board for v in row]
+
+    def _shuffled_board(self):
+        """
+        Start from the canonical grid (r, c) -> (3 * (r % 3) + r // 3 + c) % 9
+        and apply random validity-preserving transformations: band / stack
+        swaps, row / column swaps within a band / stack, digit relabeling
+        and transposition.
+        Note: every result is equivalent to the canonical grid, so this only
+        covers a subset of all Sudoku grids (see compare_fill_distributions()).
+        """
+        def shuffled(seq):
+            seq = list(seq)
+            self.rng.shuffle(seq)
+            return seq
+
+        rows = [b * 3 + r for b in shuffled(range(3)) for r in shuffled(range(3))]
+        cols = [s * 3 + c for s in shuffled(range(3)) for c in shuffled(range(3))]
+        digits = shuffled(range(1, 10))
+
+        board = [[digits[(3 * (r % 3) + r // 3 + c) % 9] for c in cols] for r in rows]
+        if self.rng.random() < 0.5:
+            board = [list(col) for col in zip(*board)]
+        return board
+
+    def compare_fill_distributions(self, samples: int = 500):
+        """
+        Sanity check of the fast fill against backtracking: for each method,
+        generate `samples` boards and return the chi-square statistic of the
+        per-cell digit counts against a uniform distribution (648 degrees of
+        freedom, so values near 648 mean "looks uniform").
+        Returns {"backtracking": chi2, "shuffle": chi2}.
+        """
+        if samples <= 0:
+            raise ValueError("Samples must be positive.")
+
+        expected = samples / 9
+        result = {}
+        for name, fast in (("backtracking", False), ("shuffle", True)):
+            counts = [[0] * 10 for _ in range(81)]
+            for _ in range(samples):
+                board = self.generate_full_board(fast=fast)
+                for i, val in enumerate(self._flatten(board)):
+                    counts[i][val] += 1
+            result[name] = sum(
+                (counts[i][d] - expected) ** 2 / expected
+                for i in range(81) for d in range(1, 10)
+            )
+        return result
+
     def _fill_board(self):
         """
         Backtracking fill for a 9x9 Sudoku board.
@@ -56,7 +334,7 @@ class SudokuGenerator:
 
         row, col = empty
         nums = list(range(1, 10))
-        random.shuffle(nums)
+        self.rng.shuffle(nums)
 
         for num in nums:
             if self._is_safe(row, col, num):
@@ -91,6 +369,176 @@ class SudokuGenerator:
         return True
 
 
+# ---------------- Compact puzzle identity & encoding ----------------
+
+def make_puzzle_id(seed: int, blanks: int = 40, difficulty: str = None, fast: bool = False) -> str:
+    """
+    Build a compact puzzle identity, e.g. "81723-b40" or "81723-hard-fast".
+    SudokuGenerator().generate_from_id() turns it back into the exact board.
+    """
+    params = difficulty if difficulty else f"b{blanks}"
+    return f"{seed}-{params}" + ("-fast" if fast else "")
+
+
+def parse_puzzle_id(puzzle_id: str):
+    """
+    Split a puzzle identity into (seed, blanks, difficulty, fast).
+    Raises ValueError on invalid format.
+    """
+    parts = puzzle_id.strip().split("-")
+    fast = parts[-1] == "fast"
+    if fast:
+        parts = parts[:-1]
+    if len(parts) != 2 or not parts[0].isdigit():
+        raise ValueError(f"Invalid puzzle id: {puzzle_id!r}")
+
+    seed, params = int(parts[0]), parts[1]
+    if params in DIFFICULTIES:
+        return seed, None, params, fast
+    if params.startswith("b") and params[1:].isdigit() and int(params[1:]) <= 81:
+        return seed, int(params[1:]), None, fast
+    raise ValueError(f"Invalid puzzle id: {puzzle_id!r}")
+
+
+PACKED_SIZE = 41  # 81 cells * 4 bits, rounded up to whole bytes
+
+
+def pack_board(board) -> bytes:
+    """
+    Pack a 9x9 board (0 = empty) into 41 bytes, two cells per byte
+    (high nibble first, last nibble is padding).
+    """
+    cells = [v for row in board for v in row] + [0]
+    return bytes((cells[i] << 4) | cells[i + 1] for i in range(0, 82, 2))
+
+
+def unpack_board(data: bytes):
+    """
+    Inverse of pack_board(): 41 bytes -> 9x9 board.
+    Raises ValueError on invalid data.
+    """
+    if len(data) != PACKED_SIZE:
+        raise ValueError(f"Packed board must be {PACKED_SIZE} bytes.")
+    cells = []
+    for byte in data:
+        cells.append(byte >> 4)
+        cells.append(byte & 0x0F)
+    if any(v > 9 for v in cells):
+        raise ValueError("Cells must be integers between 0 and 9.")
+    return [cells[r * 9:r * 9 + 9] for r in range(9)]
+
+
+# ---------------- Headless bulk generation ----------------
+
+BULK_CHUNK_SIZE = 100  # puzzles per worker task
+
+
+def board_to_string(board):
+    """
+    Compact 81-char form of a 9x9 board, row by row, '0' for empty
+    (same convention as the JSON export).
+    """
+    return "".join(str(v) for row in board for v in row)
+
+
+def _puzzle_seed(run_seed, index):
+    # 48-bit seed derived from the run seed and puzzle index only,
+    # so output does not depend on the number of workers
+    return random.Random(f"{run_seed}:{index}").getrandbits(48)
+
+
+def _generate_chunk(task):
+    """
+    Worker entry point: generate one chunk of (puzzle_id, puzzle, solution) triples.
+    """
+    seed, start, count, blanks, difficulty, fast = task
+    generator = SudokuGenerator()
+    triples = []
+    for index in range(start, start + count):
+        puzzle_id = make_puzzle_id(_puzzle_seed(seed, index), blanks, difficulty, fast)
+        puzzle = generator.generate_from_id(puzzle_id)
+        triples.append((puzzle_id, puzzle, generator.board))
+    return triples
+
+
+def generate_bulk(count, blanks=40, difficulty=None, seed=0, workers=1, fast=False):
+    """
+    Return an iterator over `count` (puzzle_id, puzzle, solution) triples in a
+    deterministic order, generated in chunks across a process pool of `workers` processes.
+    """
+    if count < 0:
+        raise ValueError("Count must not be negative.")
+    if difficulty is None and not 0 <= blanks <= 81:
+        raise ValueError("Blanks must be between 0 and 81.")
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise ValueError(f"Difficulty must be one of: {', '.join(DIFFICULTIES)}.")
+
+    tasks = [
+        (seed, start, min(BULK_CHUNK_SIZE, count - start), blanks, difficulty, fast)
+        for start in range(0, count, BULK_CHUNK_SIZE)
+    ]
+    return _iter_chunks(tasks, workers)
+
+
+def _iter_chunks(tasks, workers):
+    if workers <= 1:
+        for task in tasks:
+            yield from _generate_chunk(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() keeps chunk order, so results stream out as they complete in sequence
+        for triples in pool.map(_generate_chunk, tasks):
+            yield from triples
+
+
+def main(argv=None):
+    """
+    Command line entry point for headless bulk generation, e.g.:
+        python SudokuGen.py --count 100000 --difficulty hard --seed 7 --workers 8 -o book.jsonl
+    """
+    parser = argparse.ArgumentParser(description="Generate Sudoku puzzles in bulk.")
+    parser.add_argument("--count", type=int, required=True, help="number of puzzles")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--blanks", type=int, default=40, help="cells to blank (no uniqueness guarantee)")
+    group.add_argument("--difficulty", choices=DIFFICULTIES, help="unique-solution puzzles of this grade")
+    parser.add_argument("--seed", type=int, default=0, help="run seed (same seed -> same output)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--fast", action="store_true", help="fill solutions by shuffling a canonical grid")
+    parser.add_argument("--format", choices=("jsonl", "compact", "id", "packed"), default="jsonl",
+                        help="jsonl: {\"id\", \"puzzle\", \"solution\"} per line; "
+                             "compact: two 81-char strings per line; id: puzzle identity per line; "
+                             "packed: binary puzzle + solution, 82 bytes per record (needs -o)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.format == "packed" and not args.output:
+        parser.error("--format packed needs an output file (-o).")
+
+    try:
+        triples = generate_bulk(args.count, blanks=args.blanks, difficulty=args.difficulty,
+                                seed=args.seed, workers=args.workers, fast=args.fast)
+        if args.format == "packed":
+            out = open(args.output, "wb")
+        else:
+            out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for puzzle_id, puzzle, solution in triples:
+                if args.format == "jsonl":
+                    out.write(json.dumps({"id": puzzle_id, "puzzle": puzzle, "solution": solution}) + "\n")
+                elif args.format == "compact":
+                    out.write(f"{board_to_string(puzzle)} {board_to_string(solution)}\n")
+                elif args.format == "id":
+                    out.write(puzzle_id + "\n")
+                else:
+                    out.write(pack_board(puzzle) + pack_board(solution))
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    except ValueError as e:
+        parser.error(str(e))
+
+
 # ---------------- UI (no extra classes) ----------------
 
 class SudokuApp:
@@ -111,10 +559,88 @@ class SudokuApp:
         solution_board = {"grid": None}
         puzzle_board = {"grid": None}
 
+        # live validation state (flat index 0..80):
+        # current digit per cell, digit counts per row/col/box, cells shown as conflicting
+        cell_vars = [tk.StringVar(master=root) for _ in range(81)]
+        values = [0] * 81
+        row_counts = [[0] * 10 for _ in range(9)]
+        col_counts = [[0] * 10 for _ in range(9)]
+        box_counts = [[0] * 10 for _ in range(9)]
+        conflicted = [False] * 81
+        live = {"suspended": False}
+
+        def count_digit(i, val, delta):
+            if val:
+                row_counts[ROW_OF[i]][val] += delta
+                col_counts[COL_OF[i]][val] += delta
+                box_counts[BOX_OF[i]][val] += delta
+
+        def refresh_conflict(i):
+            """
+            Recolor cell i only if its conflict state changed.
+            """
+            val = values[i]
+            bad = bool(val) and (
+                row_counts[ROW_OF[i]][val] > 1
+                or col_counts[COL_OF[i]][val] > 1
+                or box_counts[BOX_OF[i]][val] > 1
+            )
+            if bad != conflicted[i]:
+                conflicted[i] = bad
+                bg = "#ffc0c0" if bad else "white"
+                entries[ROW_OF[i]][COL_OF[i]].config(bg=bg, disabledbackground=bg)
+
+        def show_candidates(i):
+            """
+            Show the digits still possible in cell i in the status label.
+            """
+            if values[i]:
+                label_candidates.config(text="Candidates: -")
+                return
+            r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+            cands = [
+                str(d) for d in range(1, 10)
+                if not (row_counts[r][d] or col_counts[c][d] or box_counts[b][d])
+            ]
+            label_candidates.config(text="Candidates: " + (" ".join(cands) or "none"))
+
+        def reset_live_state(board):
+            """
+            Rebuild counters from a freshly displayed board (once per load).
+            """
+            for counts in (row_counts, col_counts, box_counts):
+                for row in counts:
+                    row[:] = [0] * 10
+            for i in range(81):
+                values[i] = board[ROW_OF[i]][COL_OF[i]]
+                count_digit(i, values[i], 1)
+            for i in range(81):
+                refresh_conflict(i)
+            label_candidates.config(text="Candidates: -")
+
+        def on_cell_edit(i):
+            """
+            Called on every edit of cell i: update counters in O(1) and
+            recheck only the cell and its 20 peers.
+            """
+            if live["suspended"]:
+                return
+            text = cell_vars[i].get().strip()
+            val = int(text) if len(text) == 1 and text.isdigit() else 0
+            if val != values[i]:
+                count_digit(i, values[i], -1)
+                values[i] = val
+                count_digit(i, val, 1)
+                refresh_conflict(i)
+                for j in PEERS[i]:
+                    refresh_conflict(j)
+            show_candidates(i)
+
         def display_full_board(board):
             """
             Show a completed board; all cells black + disabled.
             """
+            live["suspended"] = True
             for r in range(9):
                 for c in range(9):
                     val = board[r][c]
@@ -124,6 +650,8 @@ class SudokuApp:
                     if val != 0:
                         e.insert(0, str(val))
                     e.config(state="disabled")
+            live["suspended"] = False
+            reset_live_state(board)
 
         def display_puzzle(board):
             """
@@ -131,6 +659,7 @@ class SudokuApp:
             - given clues: black, disabled
             - empty cells (0): enabled, blue; user can type.
             """
+            live["suspended"] = True
             for r in range(9):
                 for c in range(9):
                     val = board[r][c]
@@ -143,6 +672,8 @@ class SudokuApp:
                     else:
                         # user can type here; start as blue (unvalidated)
                         e.config(fg="blue", state="normal")
+            live["suspended"] = False
+            reset_live_state(board)
 
         def generate_full():
             board = generator.generate_full_board()
@@ -173,6 +704,14 @@ class SudokuApp:
 
             display_puzzle(board)
 
+        def generate_unique():
+            board = generator.generate_unique_puzzle(difficulty=difficulty_var.get())
+
+            solution_board["grid"] = copy.deepcopy(generator.board)
+            puzzle_board["grid"] = copy.deepcopy(board)
+
+            display_puzzle(board)
+
         def validate_user_input():
             """
             Check user input against solution.
@@ -278,12 +817,19 @@ class SudokuApp:
 
         for r in range(9):
             for c in range(9):
-                e = tk.Entry(frame_grid, width=2, justify="center", font=("Arial", 14))
+                i = r * 9 + c
+                e = tk.Entry(frame_grid, width=2, justify="center", font=("Arial", 14),
+                             textvariable=cell_vars[i], bg="white", disabledbackground="white")
                 bd_top = 2 if r % 3 == 0 else 1
                 bd_left = 2 if c % 3 == 0 else 1
                 e.grid(row=r, column=c, padx=(bd_left, 1), pady=(bd_top, 1))
                 e.config(state="disabled")
                 entries[r][c] = e
+                cell_vars[i].trace_add("write", lambda *_args, i=i: on_cell_edit(i))
+                e.bind("<FocusIn>", lambda _event, i=i: show_candidates(i))
+
+        label_candidates = tk.Label(root, text="Candidates: -", anchor="w", padx=10)
+        label_candidates.pack(fill="x")
 
         frame_controls = tk.Frame(root, padx=10, pady=10)
         frame_controls.pack(fill="x")
@@ -299,6 +845,12 @@ class SudokuApp:
         btn_puzzle = tk.Button(frame_controls, text="Generate Puzzle", command=generate_puzzle)
         btn_puzzle.pack(side="left", padx=5)
 
+        difficulty_var = tk.StringVar(value="medium")
+        tk.OptionMenu(frame_controls, difficulty_var, *DIFFICULTIES).pack(side="left")
+
+        btn_unique = tk.Button(frame_controls, text="Generate Unique", command=generate_unique)
+        btn_unique.pack(side="left", padx=5)
+
         btn_validate = tk.Button(frame_controls, text="Validate", command=validate_user_input)
         btn_validate.pack(side="left", padx=5)
 
@@ -311,6 +863,9 @@ class SudokuApp:
         root.mainloop()
 
 
-# For direct script running
+# For direct script running: no arguments -> GUI, otherwise bulk CLI
 if __name__ == "__main__":
-    SudokuApp().run()
+    if len(sys.argv) > 1:
+        main()
+    else:
+        SudokuApp().run()
@@ -1,38 +1,708 @@
 # Requires: pip install pillow
 
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from PIL import Image
+from tkinter import ttk, filedialog, messagebox
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from collections import deque
+from PIL import Image, ImageSequence
+import io
 import os
+import sys
+import json
+import time
 import shutil
+import struct
+import logging
+import multiprocessing
+import argparse
+import tempfile
+import threading
+import zlib
+
+try:
+    import resource  # peak RSS for the benchmark; not available on Windows
+except ImportError:
+    resource = None
+
+# target format -> file extension
+TARGET_FORMATS = {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp", "AVIF": ".avif"}
+INPUT_EXTENSIONS = (".webp", ".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".avif")
+
+# what to do with animated sources when the target is PNG:
+# "apng" = one animated PNG, "frames" = numbered PNGs + timings JSON, "first" = first frame only
+ANIMATION_MODES = ("apng", "frames", "first")
+
+
+def available_formats():
+    """
+    Target formats this Pillow build can write (AVIF needs a recent Pillow / libavif).
+    """
+    Image.init()
+    return [fmt for fmt in TARGET_FORMATS if fmt in Image.SAVE]
+
+
+def output_path(src, out_dir, fmt):
+    """
+    Destination for `src`: same name with the target extension,
+    in `out_dir` or next to the source if no output directory is set.
+    """
+    stem = os.path.splitext(os.path.basename(src))[0]
+    folder = out_dir or os.path.dirname(src)
+    return os.path.join(folder, stem + TARGET_FORMATS[fmt])
+
+
+def is_up_to_date(src, dst):
+    return os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src)
+
+
+def _write_atomic(dst, write):
+    """
+    Call write(tmp_path) and move the result onto `dst` with os.replace,
+    so readers never see a half-written file.
+    """
+    tmp = dst + ".part"
+    try:
+        write(tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def timings_path(dst):
+    """
+    Sidecar JSON written next to numbered frames ("frames" mode).
+    """
+    return os.path.splitext(dst)[0] + "_frames.json"
+
+
+# ---- animated sources: streamed one frame at a time ----
+
+def _png_chunks(data):
+    """
+    Yield (type, payload) for every chunk of an encoded PNG.
+    """
+    pos = 8  # skip signature
+    while pos < len(data):
+        length, ctype = struct.unpack(">I4s", data[pos:pos + 8])
+        yield ctype, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def _write_chunk(f, ctype, payload):
+    f.write(struct.pack(">I", len(payload)))
+    f.write(ctype)
+    f.write(payload)
+    f.write(struct.pack(">I", zlib.crc32(ctype + payload) & 0xFFFFFFFF))
+
+
+def write_apng(img, dst, save_options=None):
+    """
+    Write all frames of an animated image as APNG without holding more than
+    one decoded frame: each frame is encoded as a PNG on its own and its
+    IDAT data is re-wrapped as APNG frame data. Per-frame durations and the
+    loop count are kept. Returns the number of frames written.
+    """
+    save_options = save_options or {}
+    n_frames = getattr(img, "n_frames", 1)
+    loop = img.info.get("loop", 0)
+    seq = 0
+
+    with open(dst, "wb") as f:
+        for index, frame in enumerate(ImageSequence.Iterator(img)):
+            buf = io.BytesIO()
+            # RGBA for every frame so all frames share IHDR color type / depth
+            frame.convert("RGBA").save(buf, "PNG", **save_options)
+            chunks = list(_png_chunks(buf.getvalue()))
+
+            if index == 0:
+                f.write(b"\x89PNG\r\n\x1a\n")
+                _write_chunk(f, b"IHDR", next(p for t, p in chunks if t == b"IHDR"))
+                _write_chunk(f, b"acTL", struct.pack(">II", n_frames, loop))
+
+            width, height = frame.size
+            delay = min(int(frame.info.get("duration", 0)), 0xFFFF)
+            # fcTL: sequence, size, offset, delay (ms / 1000), dispose none, blend source
+            _write_chunk(f, b"fcTL", struct.pack(">IIIIIHHBB", seq, width, height, 0, 0, delay, 1000, 0, 0))
+            seq += 1
+
+            for ctype, payload in chunks:
+                if ctype != b"IDAT":
+                    continue
+                if index == 0:
+                    _write_chunk(f, b"IDAT", payload)
+                else:
+                    _write_chunk(f, b"fdAT", struct.pack(">I", seq) + payload)
+                    seq += 1
+
+        _write_chunk(f, b"IEND", b"")
+    return n_frames
+
+
+def write_png_frames(img, dst, save_options=None):
+    """
+    Write every frame of an animated image as "<name>_00000.png", ... one
+    frame at a time, plus "<name>_frames.json" with file names, durations
+    and loop count. Returns the number of frames written.
+    """
+    save_options = save_options or {}
+    base = os.path.splitext(dst)[0]
+    frames = []
+    for index, frame in enumerate(ImageSequence.Iterator(img)):
+        name = f"{base}_{index:05d}.png"
+        _write_atomic(name, lambda path: frame.save(path, "PNG", **save_options))
+        frames.append({"file": os.path.basename(name), "duration": frame.info.get("duration", 0)})
+
+    def write_timings(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"loop": img.info.get("loop", 0), "frames": frames}, f, indent=2)
+
+    # timings last: its presence marks a complete frame set
+    _write_atomic(timings_path(dst), write_timings)
+    return len(frames)
+
+
+def _convert_task(task):
+    """
+    Worker entry point: convert one file.
+    Returns (src, dst, error) with error None on success.
+    """
+    src, dst, fmt, save_options, animation = task
+    try:
+        with Image.open(src) as img:
+            if fmt == "PNG" and getattr(img, "n_frames", 1) > 1 and animation != "first":
+                if animation == "apng":
+                    _write_atomic(dst, lambda path: write_apng(img, path, save_options))
+                else:
+                    write_png_frames(img, dst, save_options)
+                return src, dst, None
+            if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")  # JPEG has no alpha / palette
+            _write_atomic(dst, lambda path: img.save(path, fmt, **save_options))
+        return src, dst, None
+    except Exception as e:
+        return src, dst, str(e)
+
+
+def convert_batch(paths, out_dir=None, fmt="PNG", save_options=None, workers=None,
+                  skip_up_to_date=True, on_progress=None, animation="apng"):
+    """
+    Convert `paths` to `fmt` across a process pool of `workers` processes.
+    Animated sources going to PNG are handled per `animation` (see ANIMATION_MODES);
+    other targets keep the first frame.
+    Files whose output is newer than the source are skipped if `skip_up_to_date`;
+    files that would be converted onto themselves are always skipped.
+    `on_progress(done, total, result)` is called after every finished file,
+    result being (src, dst, error) or (src, dst, "skipped").
+    Returns the list of results.
+    """
+    if fmt not in TARGET_FORMATS:
+        raise ValueError(f"Unknown target format: {fmt}")
+    if animation not in ANIMATION_MODES:
+        raise ValueError(f"Unknown animation mode: {animation}")
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    tasks = []
+    results = []
+    for src in paths:
+        dst = output_path(src, out_dir, fmt)
+        if os.path.abspath(dst) == os.path.abspath(src):
+            # already in the target format (e.g. a previous run's output in the folder)
+            results.append((src, dst, "skipped"))
+        elif skip_up_to_date and (is_up_to_date(src, dst) or is_up_to_date(src, timings_path(dst))):
+            results.append((src, dst, "skipped"))
+        else:
+            tasks.append((src, dst, fmt, save_options or {}, animation))
+
+    total = len(paths)
+    for done, result in enumerate(results, 1):
+        if on_progress:
+            on_progress(done, total, result)
+
+    if not tasks:
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_convert_task, task) for task in tasks]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if on_progress:
+                on_progress(len(results), total, results[-1])
+
+    return results
+
+
+# ---- headless watch mode ----
+
+log = logging.getLogger("webp_watch")
+
+WATCH_STATE_FILE = ".webp_watch_state.json"
+
+
+def _load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(path, state):
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+    _write_atomic(path, write)
+
+
+def watch_folder(inbox, out_dir=None, fmt="PNG", save_options=None, workers=2,
+                 poll_interval=1.0, metrics_interval=30.0, state_path=None,
+                 animation="apng", stop_event=None):
+    """
+    Poll `inbox` and convert every new or changed image with a bounded
+    process pool until `stop_event` is set (or Ctrl+C).
+    - a file is queued once its size and mtime are unchanged for one poll
+      (so files still being copied in are not picked up half-written)
+    - outputs are written atomically (temp file + rename)
+    - converted files are recorded by mtime in a state file, so a restart
+      does not reconvert them; entries of files that left the inbox are
+      dropped, and the state is saved on exit too
+    - throughput and queue depth are logged every `metrics_interval` seconds
+    """
+    if fmt not in TARGET_FORMATS:
+        raise ValueError(f"Unknown target format: {fmt}")
+    if animation not in ANIMATION_MODES:
+        raise ValueError(f"Unknown animation mode: {animation}")
+
+    out_dir = out_dir or os.path.join(inbox, "converted")
+    os.makedirs(out_dir, exist_ok=True)
+    state_path = state_path or os.path.join(out_dir, WATCH_STATE_FILE)
+    state = _load_state(state_path)  # file name -> mtime converted
+    stop_event = stop_event or threading.Event()
+
+    last_seen = {}  # file name -> (size, mtime) at the previous poll
+    pending = deque()
+    queued = set()  # names currently in `pending`
+    in_flight = {}  # future -> (file name, mtime)
+    max_in_flight = workers * 2  # bounds memory; the rest waits in `pending`
+    stats = {"converted": 0, "failed": 0, "window": 0}
+    next_poll = next_metrics = time.monotonic()
+    window_start = time.monotonic()
+
+    def scan():
+        present = set()
+        for entry in os.scandir(inbox):
+            name = entry.name
+            if not entry.is_file() or not name.lower().endswith(INPUT_EXTENSIONS):
+                continue
+            present.add(name)
+            if os.path.abspath(output_path(entry.path, out_dir, fmt)) == os.path.abspath(entry.path):
+                continue  # our own output (out_dir == inbox): converting it would loop forever
+            st = entry.stat()
+            if state.get(name) == st.st_mtime or any(name == n for n, _ in in_flight.values()):
+                continue
+            key = (st.st_size, st.st_mtime)
+            if last_seen.get(name) == key and name not in queued:
+                pending.append((name, st.st_mtime))
+                queued.add(name)
+            last_seen[name] = key
+
+        # forget removed files, so state and last_seen do not grow forever
+        for table in (state, last_seen):
+            for name in table.keys() - present:
+                del table[name]
+
+    def record(future):
+        name, mtime = in_flight.pop(future)
+        _, dst, error = future.result()
+        if error:
+            stats["failed"] += 1
+            log.error("Failed %s: %s", name, error)
+        else:
+            stats["converted"] += 1
+            stats["window"] += 1
+        # failures are recorded too, so a broken file is retried only when it changes
+        state[name] = mtime
+
+    log.info("Watching %s -> %s (%s, %d workers)", inbox, out_dir, fmt, workers)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                while not stop_event.is_set():
+                    now = time.monotonic()
+                    if now >= next_poll:
+                        scan()
+                        next_poll = now + poll_interval
+
+                    while pending and len(in_flight) < max_in_flight:
+                        name, mtime = pending.popleft()
+                        queued.discard(name)
+                        src = os.path.join(inbox, name)
+                        task = (src, output_path(src, out_dir, fmt), fmt, save_options or {}, animation)
+                        in_flight[pool.submit(_convert_task, task)] = (name, mtime)
+
+                    if in_flight:
+                        done, _ = wait(in_flight, timeout=0.2, return_when=FIRST_COMPLETED)
+                    else:
+                        stop_event.wait(min(0.2, poll_interval))
+                        done = ()
+
+                    for future in done:
+                        record(future)
+                    if done:
+                        _save_state(state_path, state)
+
+                    now = time.monotonic()
+                    if now >= next_metrics:
+                        elapsed = max(now - window_start, 1e-9)
+                        log.info(
+                            "converted=%d failed=%d rate=%.1f files/s queue=%d in_flight=%d",
+                            stats["converted"], stats["failed"], stats["window"] / elapsed,
+                            len(pending), len(in_flight),
+                        )
+                        stats["window"] = 0
+                        window_start = now
+                        next_metrics = now + metrics_interval
+            except KeyboardInterrupt:
+                log.info("Stopping; waiting for %d running conversion(s)", len(in_flight))
+    finally:
+        # the pool has shut down, so whatever was still in flight has finished
+        for future in [f for f in in_flight if f.done() and not f.cancelled()]:
+            record(future)
+        _save_state(state_path, state)
+
+    return stats
+
+
+# ---- benchmark mode ----
+
+BENCH_RESOLUTIONS = ((640, 480), (1920, 1080), (3840, 2160))
+BENCH_LEVELS = (0, 1, 3, 6, 9)
+BENCH_WORKERS = (1, 2, 4)
+
+
+def make_synthetic_image(width, height):
+    """
+    Photo-like test content without external data: gradients plus noise.
+    """
+    red = Image.linear_gradient("L").resize((width, height))
+    green = Image.effect_noise((width, height), 48)
+    blue = Image.radial_gradient("L").resize((width, height))
+    return Image.merge("RGB", (red, green, blue))
+
+
+def make_benchmark_inputs(folder, resolutions=BENCH_RESOLUTIONS):
+    """
+    Write one synthetic WebP per resolution into `folder`; returns their paths.
+    """
+    paths = []
+    for width, height in resolutions:
+        path = os.path.join(folder, f"bench_{width}x{height}.webp")
+        make_synthetic_image(width, height).save(path, "WEBP", quality=80)
+        paths.append(path)
+    return paths
+
+
+def _peak_rss_mb():
+    # Linux: VmHWM is the high-water mark of this process image only, while
+    # ru_maxrss is carried over from the parent through fork and exec
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024  # kB
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _children_peak_rss_mb():
+    # largest ru_maxrss among the terminated, waited-for child processes
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _bench_task(task):
+    """
+    Worker entry point, run in a freshly spawned process (a forked one
+    shares, and counts, the parent's resident pages): best-of-`repeats`
+    decode and PNG encode times and the peak RSS of this case.
+    """
+    src, level, repeats = task
+    decode_times, encode_times = [], []
+    size = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with Image.open(src) as img:
+            img.load()
+            decode_times.append(time.perf_counter() - start)
+
+            buf = io.BytesIO()
+            start = time.perf_counter()
+            img.save(buf, "PNG", compress_level=level)
+            encode_times.append(time.perf_counter() - start)
+            size = buf.tell()
+    return min(decode_times), min(encode_times), size, _peak_rss_mb()
+
+
+def _bench_batch_task(task):
+    """
+    Worker-sweep case, run in a freshly spawned process so the memory figures
+    belong to this case only: convert_batch() wall time, total output bytes,
+    the peak RSS of this driver process and of its largest pool worker.
+    """
+    copies, out_dir, workers = task
+    start = time.perf_counter()
+    results = convert_batch(copies, out_dir=out_dir, fmt="PNG", save_options={"compress_level": 6},
+                            workers=workers, skip_up_to_date=False)
+    elapsed = time.perf_counter() - start
+    size = sum(os.path.getsize(dst) for _, dst, error in results if not error)
+    return elapsed, size, _peak_rss_mb(), _children_peak_rss_mb()
+
+
+def run_benchmark(resolutions=BENCH_RESOLUTIONS, levels=BENCH_LEVELS, worker_counts=BENCH_WORKERS,
+                  repeats=3, files_per_run=8):
+    """
+    Measure PNG conversion cost on synthetic WebP inputs.
+    Returns (level_rows, worker_rows):
+    - level_rows: (resolution, level, decode_ms, encode_ms, size_kb, peak_mb)
+    - worker_rows: (resolution, workers, files_per_s, megapixels_per_s, size_kb,
+      driver_peak_mb, worker_peak_mb) for `files_per_run` conversions at
+      compress_level 6 through convert_batch(); size_kb is per output file
+    """
+    level_rows, worker_rows = [], []
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = make_benchmark_inputs(tmp, resolutions)
+
+        for (width, height), src in zip(resolutions, inputs):
+            label = f"{width}x{height}"
+            for level in levels:
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    decode, encode, size, peak = pool.submit(_bench_task, (src, level, repeats)).result()
+                level_rows.append((label, level, decode * 1000, encode * 1000, size / 1024, peak))
+
+            copies = []
+            for i in range(files_per_run):
+                copy_path = os.path.join(tmp, f"copy_{label}_{i}.webp")
+                shutil.copy(src, copy_path)
+                copies.append(copy_path)
+            out_dir = os.path.join(tmp, "out")
+            for workers in worker_counts:
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    elapsed, size, driver_peak, worker_peak = pool.submit(
+                        _bench_batch_task, (copies, out_dir, workers)).result()
+                worker_rows.append((label, workers, files_per_run / elapsed,
+                                    files_per_run * width * height / 1e6 / elapsed,
+                                    size / files_per_run / 1024, driver_peak, worker_peak))
+
+    return level_rows, worker_rows
+
+
+def format_benchmark(level_rows, worker_rows):
+    lines = [
+        "PNG encode by compress_level (best of repeats, fresh process per case)",
+        f"{'resolution':>11} {'level':>5} {'decode ms':>10} {'encode ms':>10} {'size KB':>10} {'peak MB':>8}",
+    ]
+    def mb(value, width=8):
+        return f"{value:{width}.1f}" if value is not None else f"{'n/a':>{width}}"
+
+    for label, level, decode, encode, size, peak in level_rows:
+        lines.append(f"{label:>11} {level:5d} {decode:10.1f} {encode:10.1f} {size:10.1f} {mb(peak)}")
+
+    lines += [
+        "",
+        "Batch throughput at compress_level 6 (includes process pool start-up)",
+        "(peak MB: driver process / largest worker process)",
+        f"{'resolution':>11} {'workers':>7} {'files/s':>8} {'MP/s':>8} {'size KB':>10} {'driver MB':>9} {'worker MB':>9}",
+    ]
+    for label, workers, files_per_s, mp_per_s, size, driver_peak, worker_peak in worker_rows:
+        lines.append(f"{label:>11} {workers:7d} {files_per_s:8.2f} {mp_per_s:8.1f} {size:10.1f} "
+                     f"{mb(driver_peak, 9)} {mb(worker_peak, 9)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point for the headless modes, e.g.:
+        python WebpToPngConverter.py --watch inbox/ --out converted/ --workers 4
+        python WebpToPngConverter.py --benchmark
+    """
+    parser = argparse.ArgumentParser(description="Watch a folder and convert new images, or benchmark conversion.")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--watch", help="inbox directory to watch")
+    mode.add_argument("--benchmark", action="store_true",
+                      help="measure decode/encode time, size and memory on synthetic inputs")
+    parser.add_argument("--out", help="output directory (default: <inbox>/converted)")
+    parser.add_argument("--format", choices=list(TARGET_FORMATS), default="PNG")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--interval", type=float, default=1.0, help="poll interval in seconds")
+    parser.add_argument("--metrics-interval", type=float, default=30.0, help="seconds between metric logs")
+    parser.add_argument("--compress-level", type=int, default=6, choices=range(10), metavar="0-9")
+    parser.add_argument("--animation", choices=ANIMATION_MODES, default="apng")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(format_benchmark(*run_benchmark()))
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    options = {"compress_level": args.compress_level} if args.format == "PNG" else {"quality": 90}
+    watch_folder(args.watch, out_dir=args.out, fmt=args.format, save_options=options,
+                 workers=args.workers, poll_interval=args.interval,
+                 metrics_interval=args.metrics_interval, animation=args.animation)
+
+
+def collect_images(folder):
+    return [
+        os.path.join(folder, name)
+        for name in sorted(os.listdir(folder))
+        if name.lower().endswith(INPUT_EXTENSIONS)
+    ]
+
 
 class WebpToPngConverter:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("WEBP → PNG Converter")
-        self.root.geometry("300x130")
+        self.root.geometry("420x370")
+
+        self.worker_thread = None
 
         tk.Button(self.root, text="Select WEBP and Convert",
-                  command=self.convert).pack(pady=10)
+                  command=self.convert).pack(pady=(10, 2))
+        tk.Button(self.root, text="Convert Folder",
+                  command=self.convert_folder).pack(pady=2)
+
+        # Options
+        options = tk.Frame(self.root)
+        options.pack(pady=5, padx=10, fill="x")
+
+        tk.Label(options, text="Format:").grid(row=0, column=0, sticky="w")
+        formats = available_formats()
+        self.format_var = tk.StringVar(value="PNG")
+        tk.OptionMenu(options, self.format_var, *formats).grid(row=0, column=1, sticky="w")
+
+        tk.Label(options, text="Output folder:").grid(row=1, column=0, sticky="w")
+        self.out_dir_var = tk.StringVar(value="")  # empty = next to source
+        tk.Entry(options, textvariable=self.out_dir_var, width=25).grid(row=1, column=1, sticky="we")
+        tk.Button(options, text="...", command=self.browse_out_dir).grid(row=1, column=2, padx=2)
+
+        tk.Label(options, text="PNG compress level:").grid(row=2, column=0, sticky="w")
+        self.compress_var = tk.IntVar(value=6)
+        tk.Scale(options, from_=0, to=9, orient="horizontal", variable=self.compress_var,
+                 length=120).grid(row=2, column=1, sticky="w")
+
+        tk.Label(options, text="Animated → PNG:").grid(row=5, column=0, sticky="w")
+        self.animation_var = tk.StringVar(value="apng")
+        tk.OptionMenu(options, self.animation_var, *ANIMATION_MODES).grid(row=5, column=1, sticky="w")
+
+        self.optimize_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(options, text="PNG optimize (slower, smaller)",
+                       variable=self.optimize_var).grid(row=3, column=0, columnspan=2, sticky="w")
+
+        self.skip_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(options, text="Skip files whose output is up to date",
+                       variable=self.skip_var).grid(row=4, column=0, columnspan=2, sticky="w")
+
+        options.columnconfigure(1, weight=1)
+
+        # Progress
+        self.progress = ttk.Progressbar(self.root, mode="determinate", length=380)
+        self.progress.pack(pady=(5, 2))
+        self.status_label = tk.Label(self.root, text="Ready.")
+        self.status_label.pack()
 
         tk.Button(self.root, text="Save Programm",
                   command=self.save_program).pack(pady=5)
 
+    def browse_out_dir(self):
+        folder = filedialog.askdirectory(title="Select output folder")
+        if folder:
+            self.out_dir_var.set(folder)
+
     def convert(self):
-        path = filedialog.askopenfilename(
+        paths = filedialog.askopenfilenames(
             title="Select WEBP",
-            filetypes=[("WEBP images", "*.webp")]
+            filetypes=[("WEBP images", "*.webp"), ("All images", "*.*")]
         )
-        if not path:
+        if not paths:
+            return
+        self.start_batch(list(paths))
+
+    def convert_folder(self):
+        folder = filedialog.askdirectory(title="Select folder with images")
+        if not folder:
+            return
+        paths = collect_images(folder)
+        if not paths:
+            messagebox.showinfo("Nothing to do", "No images found in that folder.")
             return
+        self.start_batch(paths)
+
+    def save_options(self, fmt):
+        if fmt == "PNG":
+            return {"compress_level": self.compress_var.get(), "optimize": self.optimize_var.get()}
+        return {"quality": 90}
+
+    def start_batch(self, paths):
+        if self.worker_thread is not None and self.worker_thread.is_alive():
+            messagebox.showwarning("Busy", "A conversion is already running.")
+            return
+
+        fmt = self.format_var.get()
+        out_dir = self.out_dir_var.get().strip() or None
+        options = self.save_options(fmt)
+        skip = self.skip_var.get()
+        animation = self.animation_var.get()
+
+        self.progress.config(maximum=len(paths), value=0)
+        self.set_status(f"Converting {len(paths)} file(s)...")
+
+        # conversion runs off the UI thread; UI updates go through after()
+        self.worker_thread = threading.Thread(
+            target=self.run_batch, args=(paths, out_dir, fmt, options, skip, animation), daemon=True
+        )
+        self.worker_thread.start()
+
+    def run_batch(self, paths, out_dir, fmt, options, skip, animation):
+        def on_progress(done, total, _result):
+            self.root.after(0, lambda: self.progress.config(value=done))
+            self.root.after(0, lambda: self.set_status(f"{done} / {total}"))
 
         try:
-            img = Image.open(path)
-            save_path = path.rsplit(".", 1)[0] + ".png"
-            img.save(save_path, "PNG")
-            messagebox.showinfo("Done", f"Saved:\n{save_path}")
+            results = convert_batch(paths, out_dir=out_dir, fmt=fmt, save_options=options,
+                                    skip_up_to_date=skip, on_progress=on_progress, animation=animation)
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            # bind the message now: `e` is unbound once the except block ends
+            msg = str(e)
+            self.root.after(0, lambda msg=msg: messagebox.showerror("Error", msg))
+            self.root.after(0, lambda: self.set_status("Failed."))
+            return
+
+        skipped = sum(1 for _, _, err in results if err == "skipped")
+        errors = [(src, err) for src, _, err in results if err not in (None, "skipped")]
+        converted = len(results) - skipped - len(errors)
+
+        def on_done():
+            self.set_status(f"Done: {converted} converted, {skipped} skipped, {len(errors)} failed.")
+            if errors:
+                details = "\n".join(f"{os.path.basename(src)}: {err}" for src, err in errors[:10])
+                messagebox.showerror("Some files failed", details)
+            elif len(paths) == 1 and converted == 1:
+                messagebox.showinfo("Done", f"Saved:\n{results[0][1]}")
+
+        self.root.after(0, on_done)
+
+    def set_status(self, text):
+        self.status_label.config(text=text)
 
     def save_program(self):
         try:
@@ -55,5 +725,9 @@ class WebpToPngConverter:
         self.root.mainloop()
 
 
+# no arguments -> GUI, otherwise headless watch mode
 if __name__ == "__main__":
-    WebpToPngConverter().run()
+    if len(sys.argv) > 1:
+        main()
+    else:
+        WebpToPngConverter().run()
@@ -2,6 +2,8 @@ import tkinter as tk
 import math
 import random
 
+from FrameScheduler import FrameScheduler
+
 
 class matrics:
     """
@@ -11,6 +13,8 @@ class matrics:
     - Shows current variables in a panel
     """
 
+    TICK_S = 0.016  # rotation speed is given in radians per ~60 FPS frame
+
     def __init__(self, root):
         self.root = root
         self.root.title("3D Matrix Demo – Rotating Cube (Auto & Manual)")
@@ -52,7 +56,8 @@ class matrics:
 
         tk.Label(auto_frame, text="Rotation speed:").pack(anchor="w")
         self.speed_scale = tk.Scale(auto_frame, from_=0, to=0.1, resolution=0.005,
-                                    orient="horizontal", length=180)
+                                    orient="horizontal", length=180,
+                                    command=lambda _val: self.scheduler.wake())
         self.speed_scale.set(0.03)
         self.speed_scale.pack()
 
@@ -120,7 +125,8 @@ class matrics:
 
         # Animation state
         self.running = True  # play/pause
-        self.animate()
+        self.scheduler = FrameScheduler(self.root, self.animate)
+        self.draw_cube()
 
         # Start with manual sliders synced to initial angles
         self.sync_sliders_from_angles()
@@ -198,21 +204,25 @@ class matrics:
 
         self.update_variables_label()
 
-    def animate(self):
-        if self.running and self.mode_var.get() == "auto":
-            speed = self.speed_scale.get()
-            self.angle_x += speed * 0.7
-            self.angle_y += speed * 1.0
-            self.angle_z += speed * 0.4
+    def animate(self, dt):
+        speed = self.speed_scale.get()
+        if not (self.running and self.mode_var.get() == "auto" and speed > 0):
+            return False  # nothing moves: the scheduler idles until woken
+
+        ticks = dt / self.TICK_S
+        self.angle_x += speed * 0.7 * ticks
+        self.angle_y += speed * 1.0 * ticks
+        self.angle_z += speed * 0.4 * ticks
 
         self.draw_cube()
-        self.root.after(16, self.animate)  # ~60 FPS
+        return True
 
     # ---------------------- Mode & controls ----------------------
 
     def toggle_animation(self):
         self.running = not self.running
         self.btn_toggle.config(text="Pause" if self.running else "Start")
+        self.scheduler.wake()
 
     def on_mode_change(self):
         mode = self.mode_var.get()
@@ -230,6 +240,8 @@ class matrics:
             self.slider_az.config(state="normal")
             # Keep angles synced with sliders
             self.sync_sliders_from_angles()
+        self.draw_cube()
+        self.scheduler.wake()
 
     def sync_sliders_from_angles(self):
         ax_deg = math.degrees(self.angle_x) % 360
@@ -256,6 +268,7 @@ class matrics:
         self.angle_z = random.uniform(0, 2 * math.pi)
         if self.mode_var.get() == "manual":
             self.sync_sliders_from_angles()
+        self.draw_cube()
 
     # ---------------------- Variables display ----------------------
 
@@ -272,6 +285,7 @@ class matrics:
             f"speed    : {speed:7.3f} (auto mode only)\n"
             f"fov      : {self.fov:7.1f}\n"
             f"dist     : {self.dist:7.2f}\n"
+            f"frames   : {self.scheduler.summary()}\n"
         )
         self.label_vars.config(text=text)
 